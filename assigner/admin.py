@@ -2,9 +2,30 @@ from django.contrib import admin
 from assigner.models import (
     User,
     Project,
+    ProjectStats,
     Task,
     SubmittedTask,
+    Tombstone,
 )
 
+
+class SubmittedTaskAdmin(admin.ModelAdmin):
+    # __str__ reads task.title and project.name for every row.
+    list_select_related = ("task", "project")
+
+
+class ProjectStatsAdmin(admin.ModelAdmin):
+    list_display = ("project", *ProjectStats.COUNTERS)
+    list_select_related = ("project",)
+
+
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ("object_type", "object_id", "user", "deleted_at")
+    list_select_related = ("user",)
+
+
 # Register your models here.
-admin.site.register([User, Project, Task, SubmittedTask])
+admin.site.register([User, Project, Task])
+admin.site.register(SubmittedTask, SubmittedTaskAdmin)
+admin.site.register(ProjectStats, ProjectStatsAdmin)
+admin.site.register(Tombstone, TombstoneAdmin)
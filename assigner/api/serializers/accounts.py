@@ -1,15 +1,22 @@
+from django.db import transaction
 from rest_framework import serializers
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema_field
 import traceback
 
 from assigner.models import (
     User,
     Project,
+    ProjectStats,
     Task,
     SubmittedTask,
+    Tombstone,
 )
+from assigner.services import review_locked_submissions, review_submissions
 from common.exceptions import UnprocessableEntityException
+from common.enums import GENDER_LABELS, ROLE_LABELS
+from common.mixins import UpdateFieldsMixin
+from common.serializer import ChoiceLabelField, ValuesSerializer
+from common.references import ReferenceResolverMixin
+from common.response_cache import invalidate_responses
 from common.utils import (
     validate_email,
     validate_password,
@@ -170,6 +177,7 @@ class LoginSerializer(serializers.Serializer):
                 }
             )
 
+        user = None
         if "email" in data:
             user = User.objects.filter(email=data.get("email")).first()
         elif "phone" in data:
@@ -205,6 +213,8 @@ class LoginSerializer(serializers.Serializer):
                     "message": "Email or Phone does not exist!",
                 }
             )
+        # The view issues tokens for this instance instead of looking it up again.
+        self.user = user
         return super().is_valid(raise_exception=raise_exception)
 
     def create(self, validated_data):
@@ -212,8 +222,8 @@ class LoginSerializer(serializers.Serializer):
 
 
 class AccountDetailSerializer(serializers.ModelSerializer):
-    role = serializers.SerializerMethodField()
-    gender = serializers.SerializerMethodField()
+    role = ChoiceLabelField(ROLE_LABELS)
+    gender = ChoiceLabelField(GENDER_LABELS)
 
     class Meta:
         model = User
@@ -236,14 +246,6 @@ class AccountDetailSerializer(serializers.ModelSerializer):
             },
         }
 
-    @extend_schema_field(OpenApiTypes.STR)
-    def get_role(self, obj):
-        return obj.get_role_display()
-
-    @extend_schema_field(OpenApiTypes.STR)
-    def get_gender(self, obj):
-        return obj.get_gender_display()
-
 
 class ProjectCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -302,7 +304,163 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
     #     return project
 
 
-class ProjectEditSerializer(serializers.ModelSerializer):
+class ProjectReadSerializer(ValuesSerializer):
+    class Meta(ValuesSerializer.Meta):
+        model = Project
+        fields = [
+            "id",
+            "name",
+            "description",
+        ]
+
+
+class TaskReadSerializer(ValuesSerializer):
+    class Meta(ValuesSerializer.Meta):
+        model = Task
+        fields = [
+            "id",
+            "title",
+            "description",
+            "project",
+            "assignee",
+            "status",
+        ]
+
+
+class SubmitTaskReadSerializer(ValuesSerializer):
+    class Meta(ValuesSerializer.Meta):
+        model = SubmittedTask
+        fields = [
+            "id",
+            "task",
+            "project",
+            "remarks",
+            "creator",
+        ]
+
+
+class ProjectSearchSerializer(ValuesSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(ValuesSerializer.Meta):
+        model = Project
+        fields = [
+            "id",
+            "name",
+            "description",
+            "status",
+            "rank",
+        ]
+
+
+class TaskSearchSerializer(ValuesSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(ValuesSerializer.Meta):
+        model = Task
+        fields = [
+            "id",
+            "title",
+            "description",
+            "project",
+            "status",
+            "rank",
+        ]
+
+
+class TaskSyncSerializer(ValuesSerializer):
+    class Meta(ValuesSerializer.Meta):
+        model = Task
+        fields = [
+            "id",
+            "title",
+            "description",
+            "project",
+            "assignee",
+            "status",
+            "modified_at",
+        ]
+
+
+class SubmitTaskSyncSerializer(ValuesSerializer):
+    class Meta(ValuesSerializer.Meta):
+        model = SubmittedTask
+        fields = [
+            "id",
+            "task",
+            "project",
+            "remarks",
+            "is_approved",
+            "submission_date",
+            "modified_at",
+        ]
+
+
+class TombstoneSerializer(ValuesSerializer):
+    class Meta(ValuesSerializer.Meta):
+        model = Tombstone
+        fields = [
+            "object_type",
+            "object_id",
+            "deleted_at",
+        ]
+
+
+class SyncSerializer(serializers.Serializer):
+    tasks = TaskSyncSerializer(many=True)
+    submissions = SubmitTaskSyncSerializer(many=True)
+    deleted = TombstoneSerializer(many=True)
+    token = serializers.CharField()
+    has_more = serializers.BooleanField()
+
+
+class ProjectSummarySerializer(ValuesSerializer):
+    """Reads the annotations added by ``Project.objects.with_summary()``."""
+
+    tasks_draft = serializers.IntegerField(read_only=True)
+    tasks_ongoing = serializers.IntegerField(read_only=True)
+    tasks_completed = serializers.IntegerField(read_only=True)
+    contributors_count = serializers.IntegerField(read_only=True)
+    last_submission_date = serializers.DateTimeField(read_only=True)
+
+    class Meta(ValuesSerializer.Meta):
+        model = Project
+        fields = [
+            "id",
+            "name",
+            "status",
+            "tasks_draft",
+            "tasks_ongoing",
+            "tasks_completed",
+            "contributors_count",
+            "last_submission_date",
+        ]
+
+
+def check_contributors(contributors, references=None):
+    if not isinstance(contributors, list) or not all(
+        validate_uuid(contributor) for contributor in contributors
+    ):
+        raise UnprocessableEntityException(
+            {
+                "title": "Project",
+                "message": "Invalid contributors",
+            }
+        )
+    if references is None:
+        return
+    if None in references.get_many(User, contributors).values():
+        raise UnprocessableEntityException(
+            {
+                "title": "Project",
+                "message": "Contributors do not exist",
+            }
+        )
+
+
+class ProjectEditSerializer(
+    ReferenceResolverMixin, UpdateFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Project
         fields = [
@@ -321,26 +479,134 @@ class ProjectEditSerializer(serializers.ModelSerializer):
     def is_valid(self, raise_exception=False):
         data = self.initial_data
         if "contributors" in data:
-            for contributor in data.get("contributors"):
-                if not validate_uuid(contributor):
-                    raise UnprocessableEntityException(
-                        {
-                            "title": "Project",
-                            "message": "Invalid contributors",
-                        }
-                    )
-                contributors = User.objects.filter(id=contributor)
-                if not contributors.exists():
-                    raise UnprocessableEntityException(
-                        {
-                            "title": "Project",
-                            "message": "Contributors do not exist",
-                        }
-                    )
+            check_contributors(data.get("contributors"), self.references)
         return super().is_valid(raise_exception=raise_exception)
 
+    def update(self, instance, validated_data):
+        contributors = validated_data.pop("contributors", None)
+        instance = super().update(instance, validated_data)
+        if contributors is not None:
+            instance.update_contributors(
+                replace=[contributor.pk for contributor in contributors]
+            )
+        return instance
+
+
+class ProjectContributorsSerializer(ReferenceResolverMixin, serializers.Serializer):
+    add = serializers.ListField(child=serializers.UUIDField(), required=False)
+    remove = serializers.ListField(child=serializers.UUIDField(), required=False)
+    replace = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+    def is_valid(self, *, raise_exception=False):
+        data = self.initial_data
+        if "replace" in data and ("add" in data or "remove" in data):
+            raise UnprocessableEntityException(
+                {
+                    "title": "Project",
+                    "message": "Replace cannot be combined with add or remove.",
+                }
+            )
+
+        if not any(key in data for key in ("add", "remove", "replace")):
+            raise UnprocessableEntityException(
+                {
+                    "title": "Project",
+                    "message": "One of add, remove or replace is required.",
+                }
+            )
+
+        if "remove" in data:
+            check_contributors(data.get("remove"))
+        if "add" in data and "remove" in data:
+            check_contributors(data.get("add"))
+            to_pk = User._meta.pk.to_python
+            if {to_pk(pk) for pk in data["add"]} & {to_pk(pk) for pk in data["remove"]}:
+                raise UnprocessableEntityException(
+                    {
+                        "title": "Project",
+                        "message": "A contributor cannot be both added and removed.",
+                    }
+                )
+        for key in ("add", "replace"):
+            if key in data:
+                check_contributors(data.get(key), self.references)
+        return super().is_valid(raise_exception=raise_exception)
+
+    def update(self, instance, validated_data):
+        self.added, self.removed = instance.update_contributors(**validated_data)
+        return instance
+
+    def to_representation(self, instance):
+        return {
+            "id": instance.pk,
+            "added": sorted(self.added),
+            "removed": sorted(self.removed),
+        }
+
+
+class TaskBulkCreateSerializer(serializers.ListSerializer):
+    max_items = 500
+
+    def is_valid(self, *, raise_exception=False):
+        data = self.initial_data
+        if not isinstance(data, list) or not data:
+            raise UnprocessableEntityException(
+                {
+                    "title": "Task",
+                    "message": "A non-empty list of tasks is required.",
+                }
+            )
+
+        if len(data) > self.max_items:
+            raise UnprocessableEntityException(
+                {
+                    "title": "Task",
+                    "message": f"At most {self.max_items} tasks can be created at once.",
+                }
+            )
+
+        errors = {}
+        items = [item for item in data if isinstance(item, dict)]
+        references = self.child.references
+        references.add(Project, *[item.get("project") for item in items])
+        references.add(User, *[item.get("assignee") for item in items])
+        for index, item in enumerate(data):
+            if not isinstance(item, dict):
+                errors[index] = "Invalid task."
+                continue
+            try:
+                self.child.check_payload(item)
+            except UnprocessableEntityException as exc:
+                errors[index] = exc.detail["message"]
+
+        if not errors and not super().is_valid():
+            for index, item_errors in enumerate(self.errors):
+                for field, messages in item_errors.items():
+                    errors.setdefault(index, f"{field}: {messages[0]}")
 
-class TaskCreateSerializer(serializers.ModelSerializer):
+        if errors:
+            raise UnprocessableEntityException(
+                {
+                    "title": "Task",
+                    "message": "Some tasks are invalid.",
+                    "errors": errors,
+                }
+            )
+        return True
+
+    def create(self, validated_data):
+        creator = self.context["request"].user
+        tasks = [Task(**item, creator=creator) for item in validated_data]
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create(tasks)
+            # bulk_create sends no post_save, so count the new tasks and
+            # drop the cached task pages here.
+            ProjectStats.count_created(tasks)
+            invalidate_responses(Task)
+        return tasks
+
+
+class TaskCreateSerializer(ReferenceResolverMixin, serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = [
@@ -360,9 +626,13 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                 "read_only": True,
             },
         }
+        list_serializer_class = TaskBulkCreateSerializer
 
     def is_valid(self, *, raise_exception=False):
-        data = self.initial_data
+        self.check_payload(self.initial_data)
+        return super().is_valid(raise_exception=raise_exception)
+
+    def check_payload(self, data):
         if data.get("title") == "" or data.get("title") is None:
             raise UnprocessableEntityException(
                 {
@@ -395,8 +665,9 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                 }
             )
 
-        project = Project.objects.filter(id=data.get("project"))
-        if not project.exists():
+        self.references.add(Project, data.get("project"))
+        self.references.add(User, data.get("assignee"))
+        if self.references.get(Project, data.get("project")) is None:
             raise UnprocessableEntityException(
                 {
                     "title": "Task",
@@ -404,8 +675,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                 }
             )
 
-        assignee = User.objects.filter(id=data.get("assignee"))
-        if not assignee.exists():
+        if self.references.get(User, data.get("assignee")) is None:
             raise UnprocessableEntityException(
                 {
                     "title": "Task",
@@ -413,16 +683,14 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                 }
             )
 
-        return super().is_valid(raise_exception=raise_exception)
-
     def create(self, validated_data):
-        submitter = super().create(validated_data)
-        submitter.creator = self.context["request"].user
-        submitter.save()
-        return submitter
+        validated_data["creator"] = self.context["request"].user
+        return super().create(validated_data)
 
 
-class TaskEditSerializer(serializers.ModelSerializer):
+class TaskEditSerializer(
+    ReferenceResolverMixin, UpdateFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Task
         fields = [
@@ -477,8 +745,9 @@ class TaskEditSerializer(serializers.ModelSerializer):
                 }
             )
 
-        project = Project.objects.filter(id=data.get("project"))
-        if not project.exists():
+        self.references.add(Project, data.get("project"))
+        self.references.add(User, data.get("assignee"))
+        if self.references.get(Project, data.get("project")) is None:
             raise UnprocessableEntityException(
                 {
                     "title": "Task",
@@ -486,15 +755,14 @@ class TaskEditSerializer(serializers.ModelSerializer):
                 }
             )
 
-        assignee_qs = User.objects.filter(id=data.get("assignee"))
-        if not assignee_qs.exists():
+        assignee = self.references.get(User, data.get("assignee"))
+        if assignee is None:
             raise UnprocessableEntityException(
                 {
                     "title": "Task",
                     "message": "Assignee does not exist.",
                 }
             )
-        assignee = assignee_qs.first()
         if not assignee.role == "U":
             raise UnprocessableEntityException(
                 {
@@ -505,7 +773,7 @@ class TaskEditSerializer(serializers.ModelSerializer):
         return super().is_valid(raise_exception=raise_exception)
 
 
-class SubmitTaskSerializer(serializers.ModelSerializer):
+class SubmitTaskSerializer(ReferenceResolverMixin, serializers.ModelSerializer):
     class Meta:
         model = SubmittedTask
         fields = [
@@ -562,8 +830,9 @@ class SubmitTaskSerializer(serializers.ModelSerializer):
                 }
             )
 
-        task = Task.objects.filter(id=data.get("task"))
-        if not task.exists():
+        self.references.add(Task, data.get("task"))
+        self.references.add(Project, data.get("project"))
+        if self.references.get(Task, data.get("task")) is None:
             raise UnprocessableEntityException(
                 {
                     "title": "Submit Task",
@@ -571,8 +840,7 @@ class SubmitTaskSerializer(serializers.ModelSerializer):
                 }
             )
 
-        project = Project.objects.filter(id=data.get("project"))
-        if not project.exists():
+        if self.references.get(Project, data.get("project")) is None:
             raise UnprocessableEntityException(
                 {
                     "title": "Submit Task",
@@ -583,10 +851,8 @@ class SubmitTaskSerializer(serializers.ModelSerializer):
         return super().is_valid(raise_exception=raise_exception)
 
     def create(self, validated_data):
-        submitter = super().create(validated_data)
-        submitter.creator = self.context["request"].user
-        submitter.save()
-        return submitter
+        validated_data["creator"] = self.context["request"].user
+        return super().create(validated_data)
 
 
 class SubmitTaskEditSerializer(serializers.ModelSerializer):
@@ -601,8 +867,82 @@ class SubmitTaskEditSerializer(serializers.ModelSerializer):
         ]
 
     def update(self, instance, validated_data):
-        validated_data["modifier"] = self.context["request"].user
-        instance = super().update(instance, validated_data)
-        instance.task.status = "O"
-        instance.task.save()
-        return instance
+        # The view loaded and locked the row with its task already.
+        reviewed = review_locked_submissions(
+            {instance.pk: instance},
+            self.context["request"].user,
+            validated_data.get("is_approved", instance.is_approved),
+        )
+        return reviewed[instance.pk]
+
+
+class SubmitTaskBulkEditSerializer(serializers.Serializer):
+    max_items = 500
+
+    ids = serializers.ListField(child=serializers.CharField())
+    is_approved = serializers.BooleanField()
+    remarks = serializers.CharField(required=False, allow_blank=True)
+
+    def is_valid(self, *, raise_exception=False):
+        data = self.initial_data
+        ids = data.get("ids")
+        if not isinstance(ids, list) or not ids:
+            raise UnprocessableEntityException(
+                {
+                    "title": "Submit Task",
+                    "message": "A non-empty list of ids is required.",
+                }
+            )
+
+        if len(ids) > self.max_items:
+            raise UnprocessableEntityException(
+                {
+                    "title": "Submit Task",
+                    "message": f"At most {self.max_items} submissions can be edited at once.",
+                }
+            )
+
+        if not isinstance(data.get("is_approved"), bool):
+            raise UnprocessableEntityException(
+                {
+                    "title": "Submit Task",
+                    "message": "Is approved is required and must be true or false.",
+                }
+            )
+
+        if data.get("remarks") is not None and not isinstance(data["remarks"], str):
+            raise UnprocessableEntityException(
+                {
+                    "title": "Submit Task",
+                    "message": "Invalid remarks.",
+                }
+            )
+        return super().is_valid(raise_exception=raise_exception)
+
+    def save(self):
+        """
+        Reviews every valid id with one call to ``review_submissions`` and
+        records the outcome of each id in ``self.results``.
+        """
+        ids = self.validated_data["ids"]
+        to_pk = SubmittedTask._meta.pk.to_python
+        valid = {pk: to_pk(pk) for pk in ids if validate_uuid(pk)}
+        reviewed = review_submissions(
+            list(dict.fromkeys(valid.values())),
+            self.context["request"].user,
+            self.validated_data["is_approved"],
+            self.validated_data.get("remarks"),
+        )
+        outcome = "approved" if self.validated_data["is_approved"] else "rejected"
+        self.results = {}
+        for pk in ids:
+            if pk not in valid:
+                self.results[pk] = "invalid"
+            elif valid[pk] in reviewed:
+                self.results[pk] = outcome
+            else:
+                self.results[pk] = "not_found"
+        return self.results
+
+    def to_representation(self, instance):
+        return {"results": self.results}
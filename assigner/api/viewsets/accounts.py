@@ -1,9 +1,10 @@
+from django.db import transaction
 from rest_framework import generics
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from common.serializer import (
+    FIELDS_PARAMETER,
     OperationError,
     OperationSuccess,
 )
@@ -11,6 +12,7 @@ from common.pagination import CustomPagination
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
+    OpenApiParameter,
     OpenApiResponse,
     OpenApiExample,
 )
@@ -19,10 +21,21 @@ from assigner.api.serializers.accounts import (
     AccountDetailSerializer,
     ProjectCreateSerializer,
     ProjectEditSerializer,
+    ProjectContributorsSerializer,
+    ProjectSummarySerializer,
+    ProjectSearchSerializer,
     TaskCreateSerializer,
     TaskEditSerializer,
     SubmitTaskSerializer,
     SubmitTaskEditSerializer,
+    SubmitTaskBulkEditSerializer,
+    ProjectReadSerializer,
+    TaskReadSerializer,
+    TaskSearchSerializer,
+    SubmitTaskReadSerializer,
+    SubmitTaskSyncSerializer,
+    SyncSerializer,
+    TaskSyncSerializer,
 )
 from assigner.models import (
     User,
@@ -31,14 +44,25 @@ from assigner.models import (
     SubmittedTask,
 )
 from assigner.api.serializers.accounts import LoginSerializer
-from common.permissions import (
-    IsHumanResource,
-    IsAuthenticated,
-    IsHrOrSupervisor,
+from assigner.sync import changes_since
+from common.permissions import RolePermission
+from common.authentication import UserClaimsRefreshToken
+from common.pagination import CustomCursorPagination
+from common.filters import (
+    CREATED_RANGE_FILTERS,
+    IndexedOrderingFilter,
+    QueryParamFilter,
 )
-from common.pagination import CustomPagination
-from common.utils import validate_uuid
-from common.exceptions import UnprocessableEntityException
+from common.mixins import (
+    CachedListMixin,
+    ConditionalListMixin,
+    EditMixin,
+    EnvelopeListMixin,
+    ValuesQuerysetMixin,
+)
+from common.export import EXPORT_WRITERS, streaming_export
+from common.response_cache import response_cache
+from common.search import SearchFilter
 
 
 @extend_schema_view(
@@ -114,11 +138,8 @@ class LoginViewSet(generics.CreateAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        if "email" in serializer.validated_data:
-            user = User.objects.filter(email=serializer.validated_data["email"]).first()
-        elif "phone" in serializer.validated_data:
-            user = User.objects.filter(phone=serializer.validated_data["phone"]).first()
-        refresh_token = RefreshToken.for_user(user)
+        user = serializer.user
+        refresh_token = UserClaimsRefreshToken.for_user(user)
         access_token = refresh_token.access_token
         return Response(
             {
@@ -154,7 +175,8 @@ class LoginViewSet(generics.CreateAPIView):
 class ProjectCreateViewSet(generics.CreateAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectCreateSerializer
-    permission_classes = [IsHumanResource]
+    permission_classes = [RolePermission]
+    permission_scope = "project-create"
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
@@ -171,6 +193,7 @@ class ProjectCreateViewSet(generics.CreateAPIView):
     get=extend_schema(
         summary="Refer to Schemas At Bottom",
         description="Project List Apis",
+        parameters=[FIELDS_PARAMETER],
         request=ProjectCreateSerializer,
         responses={
             200: OpenApiResponse(
@@ -185,21 +208,142 @@ class ProjectCreateViewSet(generics.CreateAPIView):
         tags=["Project Apis"],
     ),
 )
-class ProjectListViewSet(generics.ListAPIView):
-    queryset = Project.objects.all()
-    serializer_class = ProjectCreateSerializer
-    permission_classes = [IsAuthenticated]
+class ProjectListViewSet(
+    CachedListMixin,
+    ConditionalListMixin,
+    EnvelopeListMixin,
+    ValuesQuerysetMixin,
+    generics.ListAPIView,
+):
+    queryset = Project.objects.order_by("-created_at", "-id")
+    serializer_class = ProjectReadSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "project-list"
     http_method_names = [
         "get",
     ]
+    filter_backends = [QueryParamFilter, IndexedOrderingFilter]
+    filter_fields = {"status": "status", **CREATED_RANGE_FILTERS}
+    ordering_fields = ("created_at", "modified_at")
     pagination_class = CustomPagination
+    cache_models = (Project,)
+    envelope_title = "Project"
+    envelope_message = "Project Listed successfully"
 
-    def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description="Project Summary Apis",
+        parameters=[FIELDS_PARAMETER],
+        responses={
+            200: OpenApiResponse(
+                response=ProjectSummarySerializer(many=True),
+                description="Success Response when project summary is listed successfully",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent!",
+            ),
+        },
+        tags=["Project Apis"],
+    ),
+)
+class ProjectSummaryViewSet(
+    CachedListMixin, EnvelopeListMixin, ValuesQuerysetMixin, generics.ListAPIView
+):
+    queryset = Project.objects.with_summary().order_by("-created_at", "-id")
+    serializer_class = ProjectSummarySerializer
+    permission_classes = [RolePermission]
+    permission_scope = "project-summary"
+    http_method_names = [
+        "get",
+    ]
+    filter_backends = [QueryParamFilter, IndexedOrderingFilter]
+    filter_fields = {"status": "status", **CREATED_RANGE_FILTERS}
+    ordering_fields = ("created_at", "modified_at")
+    pagination_class = CustomPagination
+    cache_models = (Project, Task, SubmittedTask)
+    envelope_title = "Project"
+    envelope_message = "Project Summary Listed successfully"
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description="Project Search Apis, best match first",
+        parameters=[FIELDS_PARAMETER],
+        responses={
+            200: OpenApiResponse(
+                response=ProjectSearchSerializer(many=True),
+                description="Success Response when projects are searched successfully",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent!",
+            ),
+        },
+        tags=["Project Apis"],
+    ),
+)
+class ProjectSearchViewSet(
+    EnvelopeListMixin, ValuesQuerysetMixin, generics.ListAPIView
+):
+    queryset = Project.objects.all()
+    serializer_class = ProjectSearchSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "project-search"
+    http_method_names = [
+        "get",
+    ]
+    filter_backends = [QueryParamFilter, SearchFilter]
+    filter_fields = {"status": "status"}
+    pagination_class = CustomCursorPagination
+    envelope_title = "Project"
+    envelope_message = "Project Searched successfully"
+
+
+@extend_schema_view(
+    patch=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description="Project Edit Apis",
+        request=ProjectEditSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=OperationSuccess,
+                description="Success Response when project is edit successfully",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent!",
+            ),
+        },
+        tags=["Project Apis"],
+    ),
+)
+class ProjectEditViewSet(EditMixin, generics.UpdateAPIView):
+    queryset = Project.objects.all()
+    serializer_class = ProjectEditSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "project-edit"
+    http_method_names = [
+        "patch",
+    ]
+    invalid_pk_error = {
+        "title": "Project",
+        "message": "Invalid UUID",
+    }
+    not_found_error = {
+        "title": "Project",
+        "message": "Project does  not Found!",
+    }
+
+    def partial_update(self, request, *args, **kwargs):
+        response = super().partial_update(request, *args, **kwargs)
         return Response(
             {
                 "title": "Project",
-                "message": "Project Listed successfully",
+                "message": "Project edited successfully",
                 "data": response.data,
             }
         )
@@ -208,12 +352,12 @@ class ProjectListViewSet(generics.ListAPIView):
 @extend_schema_view(
     patch=extend_schema(
         summary="Refer to Schemas At Bottom",
-        description="Project Edit Apis",
-        request=ProjectEditSerializer,
+        description="Project Contributors Apis, adds/removes contributors or replaces all of them",
+        request=ProjectContributorsSerializer,
         responses={
             200: OpenApiResponse(
                 response=OperationSuccess,
-                description="Success Response when project is edit successfully",
+                description="Success Response when contributors are updated successfully",
             ),
             422: OpenApiResponse(
                 response=OperationError,
@@ -223,37 +367,29 @@ class ProjectListViewSet(generics.ListAPIView):
         tags=["Project Apis"],
     ),
 )
-class ProjectEditViewSet(generics.UpdateAPIView):
+class ProjectContributorsViewSet(EditMixin, generics.UpdateAPIView):
     queryset = Project.objects.all()
-    serializer_class = ProjectEditSerializer
-    permission_classes = [IsHumanResource]
+    serializer_class = ProjectContributorsSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "project-contributors"
     http_method_names = [
         "patch",
     ]
+    invalid_pk_error = {
+        "title": "Project",
+        "message": "Invalid UUID",
+    }
+    not_found_error = {
+        "title": "Project",
+        "message": "Project does  not Found!",
+    }
 
     def partial_update(self, request, *args, **kwargs):
-        pk = self.kwargs["pk"]
-        if not validate_uuid(pk):
-            raise UnprocessableEntityException(
-                {
-                    "title": "Project",
-                    "message": "Invalid UUID",
-                },
-                code=422,
-            )
-        if not Project.objects.filter(id=pk).exists():
-            raise UnprocessableEntityException(
-                {
-                    "title": "Project",
-                    "message": "Project does  not Found!",
-                },
-                code=422,
-            )
         response = super().partial_update(request, *args, **kwargs)
         return Response(
             {
                 "title": "Project",
-                "message": "Project edited successfully",
+                "message": "Project contributors updated successfully",
                 "data": response.data,
             }
         )
@@ -280,7 +416,8 @@ class ProjectEditViewSet(generics.UpdateAPIView):
 class TaskCreateViewSet(generics.CreateAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskCreateSerializer
-    permission_classes = [IsHrOrSupervisor]
+    permission_classes = [RolePermission]
+    permission_scope = "task-create"
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
@@ -293,6 +430,43 @@ class TaskCreateViewSet(generics.CreateAPIView):
         )
 
 
+@extend_schema_view(
+    post=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description="Task Bulk Create Apis, takes a list of tasks",
+        request=TaskCreateSerializer(many=True),
+        responses={
+            200: OpenApiResponse(
+                response=OperationSuccess,
+                description="Success Response when tasks are created successfully",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent! Lists the errors of each task by index.",
+            ),
+        },
+        tags=["Task Apis"],
+    ),
+)
+class TaskBulkCreateViewSet(generics.CreateAPIView):
+    queryset = Task.objects.all()
+    serializer_class = TaskCreateSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "task-bulk-create"
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(
+            {
+                "title": "Task",
+                "message": "Tasks created successfully",
+                "data": serializer.data,
+            }
+        )
+
+
 @extend_schema_view(
     patch=extend_schema(
         summary="Refer to Schemas At Bottom",
@@ -311,32 +485,24 @@ class TaskCreateViewSet(generics.CreateAPIView):
         tags=["Task Apis"],
     ),
 )
-class TaskEditViewSet(generics.UpdateAPIView):
-    queryset = Task.objects.all()
+class TaskEditViewSet(EditMixin, generics.UpdateAPIView):
+    queryset = Task.objects.select_related("project", "assignee")
     serializer_class = TaskEditSerializer
-    permission_classes = [IsHrOrSupervisor]
+    permission_classes = [RolePermission]
+    permission_scope = "task-edit"
     http_method_names = [
         "patch",
     ]
+    invalid_pk_error = {
+        "title": "Task",
+        "message": "Invalid UUID",
+    }
+    not_found_error = {
+        "title": "Task",
+        "message": "Task does  not exist!",
+    }
 
     def partial_update(self, request, *args, **kwargs):
-        pk = self.kwargs["pk"]
-        if not validate_uuid(pk):
-            raise UnprocessableEntityException(
-                {
-                    "title": "Task",
-                    "message": "Invalid UUID",
-                },
-                code=422,
-            )
-        if not Task.objects.filter(id=pk).exists():
-            raise UnprocessableEntityException(
-                {
-                    "title": "Task",
-                    "message": "Task does  not exist!",
-                },
-                code=422,
-            )
         response = super().partial_update(request, *args, **kwargs)
         return Response(
             {
@@ -351,6 +517,7 @@ class TaskEditViewSet(generics.UpdateAPIView):
     get=extend_schema(
         summary="Refer to Schemas At Bottom",
         description="Task List Apis",
+        parameters=[FIELDS_PARAMETER],
         request=TaskCreateSerializer,
         responses={
             200: OpenApiResponse(
@@ -365,27 +532,72 @@ class TaskEditViewSet(generics.UpdateAPIView):
         tags=["Task Apis"],
     ),
 )
-class TaskListViewSet(generics.ListAPIView):
-    queryset = Task.objects.all()
-    serializer_class = TaskCreateSerializer
-    permission_classes = [IsAuthenticated]
+class TaskListViewSet(
+    CachedListMixin,
+    ConditionalListMixin,
+    EnvelopeListMixin,
+    ValuesQuerysetMixin,
+    generics.ListAPIView,
+):
+    queryset = Task.objects.order_by("-created_at", "-id")
+    serializer_class = TaskReadSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "task-list"
     http_method_names = [
         "get",
     ]
+    filter_backends = [QueryParamFilter, IndexedOrderingFilter]
+    filter_fields = {
+        "status": "status",
+        "project": "project",
+        **CREATED_RANGE_FILTERS,
+    }
+    ordering_fields = ("created_at", "status")
+    ordering_index_prefix = ("assignee",)
     pagination_class = CustomPagination
+    cache_models = (Task,)
+    cache_scope = "user"
+    envelope_title = "Task"
+    envelope_message = "Task Listed successfully"
 
     def get_queryset(self):
-        return Task.objects.filter(assignee=self.request.user)
+        return super().get_queryset().filter(assignee=self.request.user)
 
-    def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        return Response(
-            {
-                "title": "Task",
-                "message": "Task Listed successfully",
-                "data": response.data,
-            }
-        )
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description="Task Search Apis, best match first among the user's tasks",
+        parameters=[FIELDS_PARAMETER],
+        responses={
+            200: OpenApiResponse(
+                response=TaskSearchSerializer(many=True),
+                description="Success Response when tasks are searched successfully",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent!",
+            ),
+        },
+        tags=["Task Apis"],
+    ),
+)
+class TaskSearchViewSet(EnvelopeListMixin, ValuesQuerysetMixin, generics.ListAPIView):
+    queryset = Task.objects.all()
+    serializer_class = TaskSearchSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "task-search"
+    http_method_names = [
+        "get",
+    ]
+    filter_backends = [QueryParamFilter, SearchFilter]
+    filter_fields = {"status": "status", "project": "project"}
+    pagination_class = CustomCursorPagination
+    envelope_title = "Task"
+    envelope_message = "Task Searched successfully"
+
+    def get_queryset(self):
+        return super().get_queryset().filter(assignee=self.request.user)
 
 
 @extend_schema_view(
@@ -409,7 +621,8 @@ class TaskListViewSet(generics.ListAPIView):
 class SubmitTaskViewSet(generics.CreateAPIView):
     queryset = SubmittedTask.objects.all()
     serializer_class = SubmitTaskSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RolePermission]
+    permission_scope = "task-submitting-create"
 
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
@@ -440,33 +653,29 @@ class SubmitTaskViewSet(generics.CreateAPIView):
         tags=["Task Submit Apis"],
     ),
 )
-class SubmitTaskEditViewSet(generics.UpdateAPIView):
-    queryset = SubmittedTask.objects.all()
+class SubmitTaskEditViewSet(EditMixin, generics.UpdateAPIView):
+    # Locked here, so the review does not select the row a second time.
+    queryset = SubmittedTask.objects.select_for_update().select_related("task")
     serializer_class = SubmitTaskEditSerializer
-    permission_classes = [IsHrOrSupervisor]
+    permission_classes = [RolePermission]
+    permission_scope = "task-submitted-edit"
     http_method_names = [
         "patch",
     ]
+    invalid_pk_error = {
+        "title": "Task",
+        "message": "Invalid UUID",
+    }
+    not_found_error = {
+        "title": "Submit Task",
+        "message": "Submit Task does  not exist!",
+    }
 
     def partial_update(self, request, *args, **kwargs):
-        pk = self.kwargs["pk"]
-        if not validate_uuid(pk):
-            raise UnprocessableEntityException(
-                {
-                    "title": "Task",
-                    "message": "Invalid UUID",
-                },
-                code=422,
-            )
-        if not SubmittedTask.objects.filter(id=pk).exists():
-            raise UnprocessableEntityException(
-                {
-                    "title": "Submit Task",
-                    "message": "Submit Task does  not exist!",
-                },
-                code=422,
-            )
-        response = super().partial_update(request, *args, **kwargs)
+        # Malformed ids are turned away before a transaction is opened.
+        self.get_lookup_value()
+        with transaction.atomic():
+            response = super().partial_update(request, *args, **kwargs)
         return Response(
             {
                 "title": "Submit Task",
@@ -476,10 +685,50 @@ class SubmitTaskEditViewSet(generics.UpdateAPIView):
         )
 
 
+@extend_schema_view(
+    patch=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description="Submitted Task Bulk Approve/Reject Apis, reports the outcome of each id",
+        request=SubmitTaskBulkEditSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=OperationSuccess,
+                description="Success Response when Submitted Tasks are edited successfully",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent!",
+            ),
+        },
+        tags=["Task Submit Apis"],
+    ),
+)
+class SubmitTaskBulkEditViewSet(generics.GenericAPIView):
+    serializer_class = SubmitTaskBulkEditSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "task-submitted-bulk-edit"
+    http_method_names = [
+        "patch",
+    ]
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(
+            {
+                "title": "Submit Task",
+                "message": "Submit Tasks edited successfully",
+                "data": serializer.data,
+            }
+        )
+
+
 @extend_schema_view(
     get=extend_schema(
         summary="Refer to Schemas At Bottom",
         description="Task Submit List Apis",
+        parameters=[FIELDS_PARAMETER],
         request=SubmitTaskSerializer,
         responses={
             200: OpenApiResponse(
@@ -494,21 +743,208 @@ class SubmitTaskEditViewSet(generics.UpdateAPIView):
         tags=["Task Submit Apis"],
     ),
 )
-class TaskSubmitListViewSet(generics.ListAPIView):
-    queryset = SubmittedTask.objects.all()
-    serializer_class = SubmitTaskSerializer
-    permission_classes = [IsAuthenticated]
+class TaskSubmitListViewSet(
+    CachedListMixin,
+    ConditionalListMixin,
+    EnvelopeListMixin,
+    ValuesQuerysetMixin,
+    generics.ListAPIView,
+):
+    queryset = SubmittedTask.objects.order_by("-created_at", "-id")
+    serializer_class = SubmitTaskReadSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "task-submitted-list"
     http_method_names = [
         "get",
     ]
+    filter_backends = [QueryParamFilter, IndexedOrderingFilter]
+    filter_fields = {
+        "project": "project",
+        "is_approved": "is_approved",
+        **CREATED_RANGE_FILTERS,
+    }
+    ordering_fields = ("created_at", "modified_at")
     pagination_class = CustomPagination
+    cache_models = (SubmittedTask,)
+    envelope_title = "Submit Task"
+    envelope_message = "Submit Task Listed successfully"
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description=(
+            "Every submitted task matching the filters, with its task and "
+            "project, streamed oldest first as CSV or NDJSON"
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="output",
+                type=str,
+                required=False,
+                enum=list(EXPORT_WRITERS),
+                description="Export format, csv by default",
+            ),
+        ],
+        responses={
+            (200, "text/csv"): OpenApiResponse(
+                response=str,
+                description="Success Response when submitted tasks are exported",
+            ),
+            (200, "application/x-ndjson"): OpenApiResponse(
+                response=str,
+                description="Success Response when submitted tasks are exported",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent!",
+            ),
+        },
+        tags=["Task Submit Apis"],
+    ),
+)
+class TaskSubmitExportViewSet(generics.GenericAPIView):
+    queryset = SubmittedTask.objects.order_by("created_at", "id")
+    permission_classes = [RolePermission]
+    permission_scope = "task-submitted-export"
+    http_method_names = [
+        "get",
+    ]
+    filter_backends = [QueryParamFilter]
+    filter_fields = {
+        "project": "project",
+        "is_approved": "is_approved",
+        **CREATED_RANGE_FILTERS,
+    }
+    # Rows fetched per round trip, and written per chunk of the response.
+    chunk_size = 2000
+    columns = {
+        "id": "id",
+        "task": "task",
+        "task_title": "task__title",
+        "task_status": "task__status",
+        "task_assignee": "task__assignee",
+        "project": "project",
+        "project_name": "project__name",
+        "remarks": "remarks",
+        "is_approved": "is_approved",
+        "submission_date": "submission_date",
+        "created_at": "created_at",
+        "creator": "creator",
+        "creator_name": "creator__full_name",
+    }
+
+    def get(self, request, *args, **kwargs):
+        return streaming_export(
+            self.filter_queryset(self.get_queryset()),
+            self.columns,
+            request.query_params.get("output", "csv"),
+            filename="submitted-tasks",
+            chunk_size=self.chunk_size,
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description="List response cache hits and misses of this process",
+        responses={
+            200: OpenApiResponse(
+                response=OperationSuccess,
+                description="Success Response when cache stats are listed successfully",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent!",
+            ),
+        },
+        tags=["Cache Apis"],
+    ),
+)
+class CacheStatsViewSet(generics.GenericAPIView):
+    permission_classes = [RolePermission]
+    permission_scope = "cache-stats"
+    http_method_names = [
+        "get",
+    ]
 
-    def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
+    def get(self, request, *args, **kwargs):
         return Response(
             {
-                "title": "Submit Task",
-                "message": "Submit Task Listed successfully",
-                "data": response.data,
+                "title": "Cache",
+                "message": "Cache stats listed successfully",
+                "data": response_cache.stats(),
+            }
+        )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Refer to Schemas At Bottom",
+        description=(
+            "Tasks assigned to the user and submissions they made that changed "
+            "since the token, and the ones that left either set. Apply the rows, "
+            "then the deletions, keep the returned token and ask again while "
+            "has_more is true. Without a token everything is synced."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="token",
+                type=str,
+                required=False,
+                description="Token returned by the previous sync",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                required=False,
+                description="Most rows to return per stream",
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=SyncSerializer,
+                description="Success Response when changes are listed successfully",
+            ),
+            422: OpenApiResponse(
+                response=OperationError,
+                description="Json Data Error, occurs when invalid data is sent!",
+            ),
+        },
+        tags=["Sync Apis"],
+    ),
+)
+class SyncViewSet(generics.GenericAPIView):
+    serializer_class = SyncSerializer
+    permission_classes = [RolePermission]
+    permission_scope = "sync"
+    http_method_names = [
+        "get",
+    ]
+    page_size = 500
+    max_page_size = 1000
+
+    def get(self, request, *args, **kwargs):
+        changes = changes_since(
+            request.user,
+            request.query_params.get("token"),
+            limit=self.get_limit(),
+            columns={
+                "tasks": TaskSyncSerializer.values_columns(),
+                "submissions": SubmitTaskSyncSerializer.values_columns(),
+            },
+        )
+        return Response(
+            {
+                "title": "Sync",
+                "message": "Changes listed successfully",
+                "data": self.get_serializer(changes).data,
             }
         )
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params["limit"])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(limit, self.max_page_size) if limit > 0 else self.page_size
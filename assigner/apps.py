@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class AssignerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "assigner"
+
+    def ready(self):
+        # Registers the check that list orderings are served by an index.
+        from common import filters  # noqa: F401
+        from common.search import install_missing_search_index
+
+        # Table rebuilds in later migrations can drop the search triggers.
+        post_migrate.connect(install_missing_search_index, sender=self)
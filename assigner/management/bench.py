@@ -0,0 +1,66 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from assigner.models import Project, Task, User
+
+UNITS = {"s": 1, "ms": 1e3, "us": 1e6, "ns": 1e9}
+
+
+class BenchCommand(BaseCommand):
+    """
+    Base of the ``bench_*`` commands. ``bench()`` runs in a transaction that
+    is rolled back, so whatever it seeds is gone when the command exits.
+    """
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        kwargs.setdefault("epilog", "Rows seeded for the benchmark are rolled back.")
+        return super().create_parser(prog_name, subcommand, **kwargs)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.bench(**options)
+            transaction.set_rollback(True)
+
+    def bench(self, **options):
+        raise NotImplementedError
+
+    def line(self, label, value):
+        self.stdout.write(f"{label + ':':<20}{value}")
+
+    def timed(self, label, func, number, unit="us", per="call"):
+        """
+        Writes and returns the seconds per call of ``func``, the best of three
+        runs of ``number`` calls.
+        """
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+        self.line(label, f"{seconds * UNITS[unit]:>10.2f} {unit}/{per}")
+        return seconds
+
+
+def seed_project(name, **user_fields):
+    """A user and a project to hang the benchmark's rows on."""
+    user = User.objects.create(
+        full_name=f"Bench {name}",
+        email=f"bench.{name.lower()}@example.com",
+        **user_fields,
+    )
+    return user, Project.objects.create(name="Bench", description="Bench")
+
+
+def seed_tasks(user, project, count, batch_size=5000, description="Bench"):
+    """``count`` tasks assigned to and created by ``user``, in batches."""
+    tasks = []
+    for start in range(0, count, batch_size):
+        tasks += Task.objects.bulk_create(
+            Task(
+                title=f"Task {index}",
+                description=description,
+                project=project,
+                assignee=user,
+                creator=user,
+            )
+            for index in range(start, min(start + batch_size, count))
+        )
+    return tasks
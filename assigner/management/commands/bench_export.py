@@ -0,0 +1,56 @@
+import time
+import tracemalloc
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from assigner.api.viewsets.accounts import TaskSubmitExportViewSet
+from assigner.management.bench import BenchCommand, seed_project, seed_tasks
+from assigner.models import SubmittedTask
+
+
+class Command(BenchCommand):
+    help = (
+        "Streams task-submitted-export over growing numbers of submissions and "
+        "reports the time and the peak Python memory of each export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def bench(self, rows, batch_size, **options):
+        view = TaskSubmitExportViewSet.as_view()
+        factory = APIRequestFactory()
+        user, project = seed_project("Export", role="HR")
+        seeded = 0
+        for count in sorted(rows):
+            tasks = seed_tasks(user, project, count - seeded, batch_size)
+            SubmittedTask.objects.bulk_create(
+                (
+                    SubmittedTask(
+                        task=task, project=project, creator=user, remarks="Remarks"
+                    )
+                    for task in tasks
+                ),
+                batch_size=batch_size,
+            )
+            seeded = count
+            for output in ("csv", "ndjson"):
+                request = factory.get(
+                    "/api/v1/task-submitted-export/", {"output": output}
+                )
+                force_authenticate(request, user)
+                # Timed untraced, since tracemalloc slows every allocation.
+                started = time.perf_counter()
+                size = sum(map(len, view(request).streaming_content))
+                seconds = time.perf_counter() - started
+                tracemalloc.start()
+                for chunk in view(request).streaming_content:
+                    pass
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                self.line(
+                    f"{count} rows {output}",
+                    f"{seconds * 1e3:>9.0f} ms{size / 2**20:>9.1f} MiB out"
+                    f"{peak / 2**20:>8.1f} MiB peak",
+                )
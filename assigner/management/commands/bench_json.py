@@ -0,0 +1,36 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from assigner.api.viewsets.accounts import TaskListViewSet
+from assigner.management.bench import BenchCommand, seed_project, seed_tasks
+from common.renderers import JSON_BACKENDS, load_json_backend
+
+
+class Command(BenchCommand):
+    help = (
+        "Renders a full task-list page with DRF's JSONRenderer and with every "
+        "installed fast JSON backend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--number", type=int, default=200)
+
+    def bench(self, rows, number, **options):
+        user, project = seed_project("Json")
+        seed_tasks(user, project, rows, description="Lorem ipsum dolor sit amet. " * 20)
+        request = APIRequestFactory().get("/api/v1/task-list/", {"limit": rows})
+        force_authenticate(request, user)
+        view = TaskListViewSet.as_view()
+        data = view(request).data
+        self.timed("view + serializer", lambda: view(request), number, per="page")
+
+        stock = JSONRenderer()
+        self.timed("render drf json", lambda: stock.render(data), number, per="page")
+        for name in JSON_BACKENDS:
+            loaded, dumps, _ = load_json_backend([name])
+            if loaded != name:
+                self.line(f"render {name}", "not installed")
+                continue
+            self.timed(f"render {name}", lambda: dumps(data), number, per="page")
+        self.line("payload", f"{len(stock.render(data))} bytes")
@@ -0,0 +1,39 @@
+from assigner.api.serializers.accounts import TaskCreateSerializer, TaskReadSerializer
+from assigner.management.bench import BenchCommand, seed_project, seed_tasks
+from assigner.models import Task
+
+
+class Command(BenchCommand):
+    help = (
+        "Compares fetching and serializing a task-list page as model instances "
+        "with TaskCreateSerializer and as values() rows with TaskReadSerializer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--number", type=int, default=200)
+
+    def bench(self, rows, number, **options):
+        user, project = seed_project("Serializers")
+        seed_tasks(user, project, rows, description="Lorem ipsum dolor sit amet. " * 20)
+        queryset = Task.objects.filter(assignee=user).order_by("-created_at", "-id")
+        values = queryset.values(*TaskReadSerializer.values_columns())
+        instances = list(queryset)
+        dicts = list(values)
+
+        for label, model, fast in (
+            (
+                " serializer",
+                lambda: TaskCreateSerializer(instances, many=True).data,
+                lambda: TaskReadSerializer(dicts, many=True).data,
+            ),
+            (
+                " fetch+ser",
+                lambda: TaskCreateSerializer(queryset.all(), many=True).data,
+                lambda: TaskReadSerializer(values.all(), many=True).data,
+            ),
+        ):
+            model = self.timed(f"model{label}", model, number, per="page")
+            fast = self.timed(f"values{label}", fast, number, per="page")
+            self.line("rows/s", f"{rows / model:.0f} -> {rows / fast:.0f}")
+            self.line("speedup", f"{model / fast:.1f}x")
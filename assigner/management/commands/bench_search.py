@@ -0,0 +1,62 @@
+import random
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from assigner.api.viewsets.accounts import TaskSearchViewSet
+from assigner.management.bench import BenchCommand
+from assigner.models import Project, Task, User
+
+WORDS = (
+    "invoice payment report review deploy backend frontend meeting budget "
+    "design release migrate schema client export import audit onboarding"
+).split()
+
+
+class Command(BenchCommand):
+    help = (
+        "Times task-search pages against a generated corpus, for a rare and a "
+        "common word, first page and the page after it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=100000)
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--number", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def bench(self, tasks, number, batch_size, **options):
+        randomly = random.Random(0)
+        users = User.objects.bulk_create(
+            User(full_name=f"Bench Search {index}", email=f"bench{index}@search.io")
+            for index in range(options["users"])
+        )
+        project = Project.objects.create(name="Bench", description="Bench")
+        for start in range(0, tasks, batch_size):
+            Task.objects.bulk_create(
+                Task(
+                    title=" ".join(randomly.sample(WORDS, 3)),
+                    description=" ".join(randomly.choices(WORDS, k=30))
+                    + (" zephyr" if index % 10000 == 0 else ""),
+                    project=project,
+                    assignee=randomly.choice(users),
+                    creator=users[0],
+                )
+                for index in range(start, min(start + batch_size, tasks))
+            )
+        self.line("corpus", f"{tasks} tasks")
+
+        view = TaskSearchViewSet.as_view()
+        factory = APIRequestFactory()
+        for word in ("zephyr", "invoice"):
+            request = factory.get("/api/v1/task-search/", {"q": word})
+            force_authenticate(request, users[0])
+            data = view(request).data["data"]
+            self.timed(
+                f"{word} first page", lambda: view(request), number, "ms", "request"
+            )
+            if data["pagination"]["next"]:
+                request = factory.get(data["pagination"]["next"])
+                force_authenticate(request, users[0])
+                self.timed(
+                    f"{word} next page", lambda: view(request), number, "ms", "request"
+                )
@@ -0,0 +1,40 @@
+import time
+
+from django.db import connection
+
+from assigner.management.bench import BenchCommand
+from assigner.models import User
+
+
+class Command(BenchCommand):
+    help = (
+        "Registers many users with the same full name and reports the cost of "
+        "slug allocation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--name", default="Ram Bahadur Thapa")
+
+    def bench(self, users, name, **options):
+        queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            for index in range(users):
+                User(full_name=name, email=f"bench.slug.{index}@example.com").save()
+        elapsed = time.perf_counter() - started
+        last_slug = User.objects.filter(
+            email=f"bench.slug.{users - 1}@example.com"
+        ).values_list("slug", flat=True)[0]
+
+        self.line("users", users)
+        self.line("last slug", last_slug)
+        self.line("total", f"{elapsed:.2f} s")
+        self.line("per registration", f"{elapsed / users * 1000:.3f} ms")
+        self.line("queries per user", f"{queries / users:.2f}")
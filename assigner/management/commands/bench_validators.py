@@ -0,0 +1,32 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from common.validators import VALIDATORS
+
+SAMPLES = {
+    "password": ["HIGHspeed12@", "password"],
+    "phone": ["9809461773", "12345"],
+    "email": ["kingshahi163@gmail.com", "not-an-email"],
+    "url": ["https://www.example.com/media/profile.png", "example"],
+    "uuid": ["3f2b1c4e-8a9d-4e6f-b7c8-1d2e3f4a5b6c", "project", None],
+}
+
+
+class Command(BaseCommand):
+    help = "Reports the cost of every registered validator in ns per call."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=200000)
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        for name, validator in VALIDATORS.items():
+            for value in SAMPLES.get(name, []):
+                seconds = min(
+                    timeit.repeat(lambda: validator(value), number=number, repeat=3)
+                )
+                self.stdout.write(
+                    f"{name:<10}{str(validator(value)):<7}"
+                    f"{seconds / number * 1e9:>10.1f} ns/call  {value!r}"
+                )
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from assigner.models import Tombstone
+from assigner.sync import retention_days
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes sync tombstones older than SYNC_TOMBSTONE_DAYS. Sync tokens "
+        "expire after the same time, so no client still needs them."
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=retention_days())
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f"tombstones deleted: {deleted}")
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from assigner.models import ProjectStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the ProjectStats counters from Task and SubmittedTask, "
+        "fixing any drift in the incrementally maintained values."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--project",
+            action="append",
+            dest="projects",
+            help="Only rebuild this project id. Can be given more than once.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rebuilt = ProjectStats.rebuild(
+            options["projects"], batch_size=options["batch_size"]
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"projects rebuilt:  {rebuilt}")
+        self.stdout.write(f"total:             {elapsed:.2f} s")
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.3 on 2026-10-18 05:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assigner", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlugCounter",
+            fields=[
+                ("slug", models.SlugField(primary_key=True, serialize=False)),
+                ("last", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "slug_counter",
+            },
+        ),
+    ]
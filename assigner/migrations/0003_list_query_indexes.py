@@ -0,0 +1,79 @@
+# Generated by Django 4.2.3 on 2026-10-18 05:11
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assigner", "0002_slugcounter"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="project",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="submittedtask",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(fields=["created_at", "id"], name="project_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="submittedtask",
+            index=models.Index(
+                fields=["created_at", "id"], name="submission_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submittedtask",
+            index=models.Index(
+                fields=["project", "is_approved"], name="submission_project_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submittedtask",
+            index=models.Index(
+                condition=models.Q(("is_approved", False)),
+                fields=["project", "created_at"],
+                name="submission_pending_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["assignee", "created_at", "id"],
+                name="task_assignee_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["project", "status"], name="task_project_status_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.3 on 2026-10-18 05:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_project_stats(apps, schema_editor):
+    Project = apps.get_model("assigner", "Project")
+    ProjectStats = apps.get_model("assigner", "ProjectStats")
+    Task = apps.get_model("assigner", "Task")
+    SubmittedTask = apps.get_model("assigner", "SubmittedTask")
+    counters = {"D": "tasks_draft", "O": "tasks_ongoing", "C": "tasks_completed"}
+
+    rows = {
+        pk: ProjectStats(project_id=pk)
+        for pk in Project.objects.values_list("pk", flat=True)
+    }
+    tasks = Task.objects.values("project_id", "status").annotate(
+        total=models.Count("pk")
+    )
+    for counts in tasks.order_by():
+        if counts["status"] in counters:
+            setattr(
+                rows[counts["project_id"]], counters[counts["status"]], counts["total"]
+            )
+    pending = (
+        SubmittedTask.objects.filter(is_approved=False)
+        .values("project_id")
+        .annotate(total=models.Count("pk"))
+    )
+    for counts in pending.order_by():
+        rows[counts["project_id"]].pending_approvals = counts["total"]
+    ProjectStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assigner", "0003_list_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectStats",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="assigner.project",
+                    ),
+                ),
+                ("tasks_draft", models.IntegerField(default=0)),
+                ("tasks_ongoing", models.IntegerField(default=0)),
+                ("tasks_completed", models.IntegerField(default=0)),
+                ("pending_approvals", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "Project stats",
+                "db_table": "project_stats",
+            },
+        ),
+        migrations.RunPython(backfill_project_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.3 on 2026-10-18 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assigner", "0004_projectstats"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="submittedtask",
+            index=models.Index(
+                fields=["project", "submission_date"], name="submission_latest_idx"
+            ),
+        ),
+    ]
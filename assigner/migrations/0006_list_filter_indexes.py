@@ -0,0 +1,26 @@
+# Generated by Django 4.2.3 on 2026-10-18 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assigner", "0005_submission_latest_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["status", "created_at", "id"], name="project_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["assignee", "status", "created_at", "id"],
+                name="task_assignee_status_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 4.2.3 on 2026-10-18 06:02
+
+from django.db import migrations
+
+# The DDL is spelled out rather than built by common.search, so later changes
+# there do not change what this migration did. Per database vendor, the
+# statements to install and to uninstall the full-text index.
+SEARCH_INDEX_SQL = {
+    "postgresql": (
+        [
+            'ALTER TABLE "assigner_project" ADD COLUMN "search_vector" tsvector '
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english'::regconfig, "
+            "coalesce(\"name\", '')), 'A') || "
+            "setweight(to_tsvector('english'::regconfig, "
+            "coalesce(\"description\", '')), 'B')) STORED",
+            'CREATE INDEX "assigner_project_search_idx" ON "assigner_project" '
+            'USING GIN ("search_vector")',
+            'ALTER TABLE "assigner_task" ADD COLUMN "search_vector" tsvector '
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english'::regconfig, "
+            "coalesce(\"title\", '')), 'A') || "
+            "setweight(to_tsvector('english'::regconfig, "
+            "coalesce(\"description\", '')), 'B')) STORED",
+            'CREATE INDEX "assigner_task_search_idx" ON "assigner_task" '
+            'USING GIN ("search_vector")',
+        ],
+        [
+            'DROP INDEX IF EXISTS "assigner_project_search_idx"',
+            'ALTER TABLE "assigner_project" DROP COLUMN IF EXISTS "search_vector"',
+            'DROP INDEX IF EXISTS "assigner_task_search_idx"',
+            'ALTER TABLE "assigner_task" DROP COLUMN IF EXISTS "search_vector"',
+        ],
+    ),
+    "sqlite": (
+        [
+            'CREATE VIRTUAL TABLE "assigner_project_fts" USING '
+            'fts5("name", "description", content = \'assigner_project\', '
+            "tokenize = 'porter unicode61')",
+            'INSERT INTO "assigner_project_fts" ("assigner_project_fts") '
+            "VALUES ('rebuild')",
+            'CREATE TRIGGER "assigner_project_fts_insert" '
+            'AFTER INSERT ON "assigner_project" BEGIN '
+            'INSERT INTO "assigner_project_fts" (rowid, "name", "description") '
+            'VALUES (new.rowid, new."name", new."description"); END',
+            'CREATE TRIGGER "assigner_project_fts_update" '
+            'AFTER UPDATE OF "name", "description" ON "assigner_project" BEGIN '
+            'INSERT INTO "assigner_project_fts" '
+            '("assigner_project_fts", rowid, "name", "description") '
+            'VALUES (\'delete\', old.rowid, old."name", old."description"); '
+            'INSERT INTO "assigner_project_fts" (rowid, "name", "description") '
+            'VALUES (new.rowid, new."name", new."description"); END',
+            'CREATE TRIGGER "assigner_project_fts_delete" '
+            'AFTER DELETE ON "assigner_project" BEGIN '
+            'INSERT INTO "assigner_project_fts" '
+            '("assigner_project_fts", rowid, "name", "description") '
+            'VALUES (\'delete\', old.rowid, old."name", old."description"); END',
+            'CREATE VIRTUAL TABLE "assigner_task_fts" USING '
+            'fts5("title", "description", content = \'assigner_task\', '
+            "tokenize = 'porter unicode61')",
+            'INSERT INTO "assigner_task_fts" ("assigner_task_fts") '
+            "VALUES ('rebuild')",
+            'CREATE TRIGGER "assigner_task_fts_insert" '
+            'AFTER INSERT ON "assigner_task" BEGIN '
+            'INSERT INTO "assigner_task_fts" (rowid, "title", "description") '
+            'VALUES (new.rowid, new."title", new."description"); END',
+            'CREATE TRIGGER "assigner_task_fts_update" '
+            'AFTER UPDATE OF "title", "description" ON "assigner_task" BEGIN '
+            'INSERT INTO "assigner_task_fts" '
+            '("assigner_task_fts", rowid, "title", "description") '
+            'VALUES (\'delete\', old.rowid, old."title", old."description"); '
+            'INSERT INTO "assigner_task_fts" (rowid, "title", "description") '
+            'VALUES (new.rowid, new."title", new."description"); END',
+            'CREATE TRIGGER "assigner_task_fts_delete" '
+            'AFTER DELETE ON "assigner_task" BEGIN '
+            'INSERT INTO "assigner_task_fts" '
+            '("assigner_task_fts", rowid, "title", "description") '
+            'VALUES (\'delete\', old.rowid, old."title", old."description"); END',
+        ],
+        [
+            'DROP TRIGGER IF EXISTS "assigner_project_fts_insert"',
+            'DROP TRIGGER IF EXISTS "assigner_project_fts_update"',
+            'DROP TRIGGER IF EXISTS "assigner_project_fts_delete"',
+            'DROP TABLE IF EXISTS "assigner_project_fts"',
+            'DROP TRIGGER IF EXISTS "assigner_task_fts_insert"',
+            'DROP TRIGGER IF EXISTS "assigner_task_fts_update"',
+            'DROP TRIGGER IF EXISTS "assigner_task_fts_delete"',
+            'DROP TABLE IF EXISTS "assigner_task_fts"',
+        ],
+    ),
+}
+
+
+def install_search_index(apps, schema_editor):
+    install, _ = SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ((), ()))
+    for statement in install:
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(apps, schema_editor):
+    _, uninstall = SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ((), ()))
+    for statement in uninstall:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assigner", "0006_list_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.3 on 2026-10-18 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assigner", "0008_sync_tombstones"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["modified_at", "id"], name="project_modified_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submittedtask",
+            index=models.Index(
+                fields=["modified_at", "id"], name="submission_modified_at_idx"
+            ),
+        ),
+    ]
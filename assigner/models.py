@@ -1,8 +1,18 @@
-from django.db import models
+from collections import defaultdict
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from uuid import uuid4
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.dispatch import receiver
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import (
+    pre_save,
+    post_save,
+    pre_delete,
+    post_delete,
+    m2m_changed,
+)
 
 from common.enums import (
     GENDER_CHOICES,
@@ -13,10 +23,31 @@ from common.utils import (
     unique_slug_generator,
 )
 from common.models import CommonInfo
+from common.response_cache import invalidate_responses
+
+SLUG_ALLOCATION_ATTEMPTS = 5
+
+TASK_STATUS_COUNTERS = {
+    "D": "tasks_draft",
+    "O": "tasks_ongoing",
+    "C": "tasks_completed",
+}
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        # UPDATE sends no post_save, so a block or role change applied here
+        # would otherwise be served from the cached users until they expire.
+        # Imported here: the authentication module needs the app registry.
+        from common.authentication import invalidate_cached_users
+
+        invalidate_cached_users()
+        return rows
 
 
 # Create your models here.
-class UserManager(BaseUserManager):
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     def create_user(self, email, password):
         user = self.model(email=self.normalize_email(email), password=password)
         user.set_password(password)
@@ -32,9 +63,7 @@ class UserManager(BaseUserManager):
 
 
 class User(AbstractBaseUser):
-    id = models.UUIDField(
-        primary_key=True, default=uuid4, editable=False, db_index=True
-    )
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     slug = models.SlugField(unique=True, null=True, blank=True)
     full_name = models.CharField(max_length=255, null=False, blank=False)
     phone = models.CharField(unique=True, max_length=10, null=True, blank=True)
@@ -55,6 +84,28 @@ class User(AbstractBaseUser):
     def __str__(self) -> str:
         return f"{self.full_name}--{self.email}"
 
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        if kwargs.get("update_fields") is not None:
+            # A partial save of a user without a slug (e.g. a password
+            # rehash) writes the slug it allocates too, not just burns it.
+            kwargs["update_fields"] = {*kwargs["update_fields"], "slug"}
+        # Slugs that predate the counter table can still collide with a
+        # freshly counted one, so allocate again when the unique constraint
+        # on slug is what failed. The counter is bumped outside the savepoint
+        # so a retry never gets the same number back.
+        for attempt in range(SLUG_ALLOCATION_ATTEMPTS):
+            self.slug = unique_slug_generator(self)
+            try:
+                with transaction.atomic(using=kwargs.get("using")):
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                taken = User.objects.filter(slug=self.slug).exists()
+                if not taken or attempt + 1 == SLUG_ALLOCATION_ATTEMPTS:
+                    self.slug = None
+                    raise
+
     def has_perm(self, perm, obj=None):
         """Does the user have a specific permission?"""
         if self.is_blocked:
@@ -84,17 +135,135 @@ def user_pre_save_receiver(sender, instance=User, *args, **kwargs):
         instance.slug = unique_slug_generator(instance)
 
 
+class SlugCounter(models.Model):
+    """Last number handed out per base slug, see unique_slug_generator."""
+
+    slug = models.SlugField(primary_key=True)
+    last = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "slug_counter"
+
+
+def count_subquery(queryset, field):
+    """COUNT(*) of ``queryset`` per ``field``, as a correlated subquery."""
+    counted = queryset.order_by().values(field).annotate(total=Count("*"))
+    return Coalesce(
+        Subquery(counted.values("total"), output_field=models.IntegerField()), 0
+    )
+
+
+class ProjectQuerySet(models.QuerySet):
+    def with_summary(self):
+        """
+        Annotates task counts by status, the contributor count and the latest
+        submission date. Each is a correlated subquery over an index, so the
+        cost is per returned project, not per row of the related tables.
+        """
+        tasks = Task.objects.filter(project=OuterRef("pk"))
+        contributors = Project.contributors.through.objects.filter(
+            project=OuterRef("pk")
+        )
+        submissions = SubmittedTask.objects.filter(project=OuterRef("pk"))
+        return self.annotate(
+            **{
+                name: count_subquery(tasks.filter(status=status), "project")
+                for status, name in TASK_STATUS_COUNTERS.items()
+            },
+            contributors_count=count_subquery(contributors, "project"),
+            last_submission_date=Subquery(
+                submissions.order_by("-submission_date").values("submission_date")[:1]
+            ),
+        )
+
+
 class Project(CommonInfo):
     name = models.CharField(max_length=100)
     description = models.TextField()
     contributors = models.ManyToManyField(User, related_name="contributed_projects")
     status = models.CharField(max_length=1, choices=STATUS_CHOICES, default="D")
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="project_created_idx"),
+            models.Index(fields=["modified_at", "id"], name="project_modified_idx"),
+            models.Index(
+                fields=["status", "created_at", "id"], name="project_status_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def update_contributors(self, add=(), remove=(), replace=None):
+        """
+        Applies a contributor diff with one read of the through table, one
+        bulk insert and one delete. Returns the sets of added and removed ids.
+        """
+        through = Project.contributors.through
+        to_pk = User._meta.pk.to_python
+        rows = through.objects.filter(project_id=self.pk)
+        current = set(rows.values_list("user_id", flat=True))
+        if replace is not None:
+            target = {to_pk(pk) for pk in replace}
+        else:
+            target = (current | {to_pk(pk) for pk in add}) - {
+                to_pk(pk) for pk in remove
+            }
+        added = target - current
+        removed = current - target
+
+        if not added and not removed:
+            return added, removed
+        with transaction.atomic(using=rows.db):
+            if removed:
+                rows.filter(user_id__in=removed).delete()
+            if added:
+                through.objects.bulk_create(
+                    [through(project_id=self.pk, user_id=pk) for pk in added],
+                    ignore_conflicts=True,
+                )
+        for action, pk_set in (("post_remove", removed), ("post_add", added)):
+            if pk_set:
+                m2m_changed.send(
+                    sender=through,
+                    instance=self,
+                    action=action,
+                    reverse=False,
+                    model=User,
+                    pk_set=pk_set,
+                    using=rows.db,
+                )
+        return added, removed
+
+
+class ProjectStatsCounted:
+    """
+    Models counted in ``ProjectStats``. Remembers which counter a row was
+    counted under when it was loaded, so a save only moves the difference.
+    Subclasses name their project foreign key in ``stats_project_field`` and
+    say which counter a row belongs to in ``stats_counter()``.
+    """
+
+    stats_project_field = "project"
 
-class Task(CommonInfo):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not instance.get_deferred_fields():
+            instance._stats_key = instance.stats_key()
+        return instance
+
+    def stats_key(self):
+        field = self._meta.get_field(self.stats_project_field)
+        return getattr(self, field.attname), self.stats_counter()
+
+    def stats_counter(self):
+        return None
+
+
+class Task(ProjectStatsCounted, CommonInfo):
     title = models.CharField(max_length=100)
     description = models.TextField()
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="tasks")
@@ -107,11 +276,40 @@ class Task(CommonInfo):
     )
     status = models.CharField(max_length=1, choices=STATUS_CHOICES, default="D")
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["assignee", "created_at", "id"],
+                name="task_assignee_created_idx",
+            ),
+            models.Index(fields=["project", "status"], name="task_project_status_idx"),
+            models.Index(
+                fields=["assignee", "status", "created_at", "id"],
+                name="task_assignee_status_idx",
+            ),
+            models.Index(
+                fields=["assignee", "modified_at", "id"],
+                name="task_assignee_modified_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The assignee it was loaded with, so a reassignment can leave a
+        # tombstone for the previous assignee's sync.
+        if "assignee_id" in instance.__dict__:
+            instance._loaded_assignee_id = instance.assignee_id
+        return instance
+
+    def stats_counter(self):
+        return TASK_STATUS_COUNTERS.get(self.status)
+
 
-class SubmittedTask(CommonInfo):
+class SubmittedTask(ProjectStatsCounted, CommonInfo):
     task = models.ForeignKey(
         Task, on_delete=models.CASCADE, related_name="submitted_tasks"
     )
@@ -122,5 +320,274 @@ class SubmittedTask(CommonInfo):
     is_approved = models.BooleanField(default=False)
     remarks = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="submission_created_idx"),
+            models.Index(
+                fields=["modified_at", "id"], name="submission_modified_at_idx"
+            ),
+            models.Index(
+                fields=["project", "is_approved"], name="submission_project_idx"
+            ),
+            models.Index(
+                fields=["project", "created_at"],
+                condition=models.Q(is_approved=False),
+                name="submission_pending_idx",
+            ),
+            models.Index(
+                fields=["project", "submission_date"], name="submission_latest_idx"
+            ),
+            models.Index(
+                fields=["creator", "modified_at", "id"],
+                name="submission_modified_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"SubmittedTask: {self.task.title} (Project: {self.project.name})"
+
+    def stats_counter(self):
+        return None if self.is_approved else "pending_approvals"
+
+
+class ProjectStats(models.Model):
+    """
+    Task and approval counters per project, moved with ``F()`` updates as
+    tasks and submissions change. ``rebuild()`` recomputes them from the
+    source tables.
+    """
+
+    project = models.OneToOneField(
+        Project, primary_key=True, on_delete=models.CASCADE, related_name="stats"
+    )
+    tasks_draft = models.IntegerField(default=0)
+    tasks_ongoing = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+    pending_approvals = models.IntegerField(default=0)
+
+    COUNTERS = (*TASK_STATUS_COUNTERS.values(), "pending_approvals")
+
+    class Meta:
+        db_table = "project_stats"
+        verbose_name_plural = "Project stats"
+
+    def __str__(self):
+        return f"Stats: {self.project_id}"
+
+    @classmethod
+    def apply(cls, changes, heal=True):
+        """
+        Applies ``(project_id, counter, delta)`` changes with one UPDATE per
+        project. Projects without a stats row are rebuilt when ``heal`` is set.
+        """
+        deltas = defaultdict(lambda: defaultdict(int))
+        for project_id, counter, delta in changes:
+            if project_id is not None and counter is not None:
+                deltas[project_id][counter] += delta
+        missing = []
+        for project_id, counters in deltas.items():
+            counters = {name: delta for name, delta in counters.items() if delta}
+            if not counters:
+                continue
+            updated = cls.objects.filter(project_id=project_id).update(
+                **{name: F(name) + delta for name, delta in counters.items()}
+            )
+            if not updated:
+                missing.append(project_id)
+        if heal and missing:
+            cls.rebuild(missing)
+
+    @classmethod
+    def count_created(cls, instances):
+        cls.apply((*instance.stats_key(), 1) for instance in instances)
+        for instance in instances:
+            instance._stats_key = instance.stats_key()
+
+    @classmethod
+    def rebuild(cls, project_ids=None, batch_size=1000):
+        """
+        Recomputes the counters of ``project_ids`` (all projects by default)
+        from Task and SubmittedTask, ``batch_size`` projects per upsert.
+        Returns the number of projects rebuilt.
+        """
+        projects = Project.objects.order_by("pk").values_list("pk", flat=True)
+        if project_ids is not None:
+            projects = projects.filter(pk__in=project_ids)
+        batch = []
+        rebuilt = 0
+        for project_id in projects.iterator(chunk_size=batch_size):
+            batch.append(project_id)
+            if len(batch) == batch_size:
+                rebuilt += cls._rebuild_batch(batch)
+                batch = []
+        if batch:
+            rebuilt += cls._rebuild_batch(batch)
+        return rebuilt
+
+    @classmethod
+    def _rebuild_batch(cls, project_ids):
+        rows = {pk: cls(project_id=pk) for pk in project_ids}
+        tasks = (
+            Task.objects.filter(project_id__in=project_ids)
+            .values("project_id")
+            .annotate(
+                **{
+                    name: Count("pk", filter=Q(status=status))
+                    for status, name in TASK_STATUS_COUNTERS.items()
+                }
+            )
+            .order_by()
+        )
+        for counts in tasks:
+            row = rows[counts.pop("project_id")]
+            for name, value in counts.items():
+                setattr(row, name, value)
+        pending = (
+            SubmittedTask.objects.filter(project_id__in=project_ids, is_approved=False)
+            .values("project_id")
+            .annotate(pending_approvals=Count("pk"))
+            .order_by()
+        )
+        for counts in pending:
+            rows[counts["project_id"]].pending_approvals = counts["pending_approvals"]
+        cls.objects.bulk_create(
+            rows.values(),
+            update_conflicts=True,
+            unique_fields=["project"],
+            update_fields=cls.COUNTERS,
+        )
+        return len(rows)
+
+
+class Tombstone(models.Model):
+    """
+    A task or submission that left a user's sync set: it was deleted, or,
+    for a task, assigned to someone else. ``assigner.sync`` hands these out
+    as deletions.
+    """
+
+    TASK = "task"
+    SUBMISSION = "submission"
+    OBJECT_TYPES = ((TASK, "Task"), (SUBMISSION, "Submitted Task"))
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    object_type = models.CharField(max_length=10, choices=OBJECT_TYPES)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "sync_tombstone"
+        indexes = [
+            models.Index(
+                fields=["user", "deleted_at", "id"], name="tombstone_user_idx"
+            ),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"Tombstone: {self.object_type} {self.object_id}"
+
+
+@receiver(post_save, sender=Project)
+def project_stats_create_receiver(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        ProjectStats.objects.get_or_create(project=instance)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=SubmittedTask)
+def project_stats_save_receiver(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    current = instance.stats_key()
+    if created:
+        ProjectStats.apply([(*current, 1)])
+    elif not hasattr(instance, "_stats_key"):
+        # Not loaded from the database, so there is no telling what it was
+        # counted as before; recount its project.
+        ProjectStats.rebuild([instance.project_id])
+    elif instance._stats_key != current:
+        ProjectStats.apply([(*instance._stats_key, -1), (*current, 1)])
+    instance._stats_key = current
+
+
+def deleted_with_project(origin):
+    """
+    Whether a delete started from a project (or a queryset of them), so the
+    rows cascading with it need no per-row bookkeeping.
+    """
+    model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    return issubclass(model, Project)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=SubmittedTask)
+def project_stats_delete_receiver(sender, instance, origin=None, **kwargs):
+    if deleted_with_project(origin):
+        # The stats row goes with the project.
+        return
+    key = getattr(instance, "_stats_key", None) or instance.stats_key()
+    ProjectStats.apply([(*key, -1)], heal=False)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=SubmittedTask)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=SubmittedTask)
+def response_cache_receiver(sender, **kwargs):
+    invalidate_responses(sender)
+
+
+@receiver(m2m_changed, sender=Project.contributors.through)
+def response_cache_contributors_receiver(sender, action, **kwargs):
+    if action.startswith("post_"):
+        invalidate_responses(Project)
+
+
+@receiver(pre_delete, sender=Project)
+def project_tombstone_delete_receiver(sender, instance, **kwargs):
+    # The tombstones of everything the project takes with it, in one insert
+    # rather than one per cascaded row.
+    tombstones = [
+        Tombstone(user_id=user_id, object_type=object_type, object_id=pk)
+        for object_type, rows, user_field in (
+            (Tombstone.TASK, instance.tasks, "assignee_id"),
+            (Tombstone.SUBMISSION, instance.submitted_tasks, "creator_id"),
+        )
+        for user_id, pk in rows.filter(**{f"{user_field}__isnull": False})
+        .values_list(user_field, "pk")
+        .order_by()
+    ]
+    Tombstone.objects.bulk_create(tombstones)
+
+
+@receiver(post_delete, sender=Task)
+def task_tombstone_delete_receiver(sender, instance, origin=None, **kwargs):
+    if instance.assignee_id is not None and not deleted_with_project(origin):
+        Tombstone.objects.create(
+            user_id=instance.assignee_id,
+            object_type=Tombstone.TASK,
+            object_id=instance.pk,
+        )
+
+
+@receiver(post_save, sender=Task)
+def task_tombstone_reassign_receiver(sender, instance, created, raw, **kwargs):
+    previous = getattr(instance, "_loaded_assignee_id", None)
+    if not created and not raw and previous not in (None, instance.assignee_id):
+        Tombstone.objects.create(
+            user_id=previous, object_type=Tombstone.TASK, object_id=instance.pk
+        )
+    instance._loaded_assignee_id = instance.assignee_id
+
+
+@receiver(post_delete, sender=SubmittedTask)
+def submission_tombstone_delete_receiver(sender, instance, origin=None, **kwargs):
+    if instance.creator_id is not None and not deleted_with_project(origin):
+        Tombstone.objects.create(
+            user_id=instance.creator_id,
+            object_type=Tombstone.SUBMISSION,
+            object_id=instance.pk,
+        )
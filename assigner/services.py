@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.utils import timezone
+
+from common.response_cache import invalidate_responses
+
+from assigner.models import (
+    ProjectStats,
+    SubmittedTask,
+    Task,
+)
+
+# A reviewed submission sends its task back to ongoing, approved or not.
+REVIEWED_TASK_STATUS = "O"
+
+
+def review_submissions(ids, user, is_approved, remarks=None):
+    """
+    Approves (or rejects) the submissions in ``ids`` on behalf of ``user`` and
+    moves their tasks to ongoing.
+
+    The submissions and their tasks are locked with ``SELECT ... FOR UPDATE``
+    in primary key order and written with one ``UPDATE`` per table, so
+    concurrent reviews of the same rows queue up instead of overwriting each
+    other. Returns the reviewed submissions, updated in memory, keyed by id.
+    Ids that do not exist are left out.
+    """
+    if not ids:
+        return {}
+    with transaction.atomic():
+        submissions = {
+            submission.pk: submission
+            for submission in SubmittedTask.objects.select_for_update()
+            .select_related("task")
+            .filter(pk__in=ids)
+            .order_by("pk")
+        }
+        return review_locked_submissions(submissions, user, is_approved, remarks)
+
+
+def review_locked_submissions(submissions, user, is_approved, remarks=None):
+    """
+    The writes of ``review_submissions`` for ``submissions`` (keyed by id)
+    that the caller already holds locked, loaded with their tasks. Must run
+    inside the caller's transaction.
+    """
+    if not submissions:
+        return {}
+    now = timezone.now()
+    values = {"is_approved": is_approved, "modifier": user, "modified_at": now}
+    if remarks is not None:
+        values["remarks"] = remarks
+    SubmittedTask.objects.filter(pk__in=submissions).update(**values)
+
+    tasks = {submission.task_id: submission.task for submission in submissions.values()}
+    moved = [task for task in tasks.values() if task.status != REVIEWED_TASK_STATUS]
+    task_values = {
+        "status": REVIEWED_TASK_STATUS,
+        "modifier": user,
+        "modified_at": now,
+    }
+    if moved:
+        Task.objects.filter(pk__in=[task.pk for task in moved]).update(**task_values)
+
+    # UPDATE sends no post_save, so move the counters here.
+    changes = []
+    for instances, written in (
+        (submissions.values(), values),
+        (moved, task_values),
+    ):
+        for instance in instances:
+            changes.append((*instance.stats_key(), -1))
+            for name, value in written.items():
+                setattr(instance, name, value)
+            instance._stats_key = instance.stats_key()
+            changes.append((*instance._stats_key, 1))
+    ProjectStats.apply(changes)
+    invalidate_responses(SubmittedTask, *([Task] if moved else []))
+    return submissions
@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from assigner.models import SubmittedTask, Task, Tombstone
+from common.exceptions import UnprocessableEntityException
+
+SYNC_TOKEN_SALT = "assigner.sync"
+
+
+def settle_seconds():
+    return getattr(settings, "SYNC_SETTLE_SECONDS", 5)
+
+
+def retention_days():
+    return getattr(settings, "SYNC_TOMBSTONE_DAYS", 30)
+
+
+def sync_streams(user):
+    """
+    ``{name: (queryset, timestamp field)}`` for everything synced to ``user``:
+    the tasks assigned to them, the submissions they made and the tombstones
+    of rows that left either set.
+    """
+    return {
+        "tasks": (Task.objects.filter(assignee=user), "modified_at"),
+        "submissions": (SubmittedTask.objects.filter(creator=user), "modified_at"),
+        "deleted": (Tombstone.objects.filter(user=user), "deleted_at"),
+    }
+
+
+def encode_token(user, since, after):
+    return signing.dumps(
+        {"u": str(user.pk), "t": since.isoformat(), "a": after},
+        salt=SYNC_TOKEN_SALT,
+        compress=True,
+    )
+
+
+def decode_token(user, token):
+    """
+    ``(since, after)`` from a token issued to ``user``. Tokens older than the
+    tombstone retention are refused: deletions since then may be gone, so the
+    client has to start over without a token.
+    """
+    try:
+        payload = signing.loads(
+            token,
+            salt=SYNC_TOKEN_SALT,
+            max_age=timedelta(days=retention_days()),
+        )
+        since = parse_datetime(payload["t"])
+        if payload["u"] != str(user.pk) or since is None:
+            raise ValueError
+        return since, dict(payload["a"])
+    except signing.SignatureExpired:
+        raise UnprocessableEntityException(
+            {
+                "title": "Sync",
+                "message": "Sync token expired, sync again without a token",
+            }
+        )
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise UnprocessableEntityException(
+            {
+                "title": "Sync",
+                "message": "Invalid sync token",
+            }
+        )
+
+
+def changes_since(user, token=None, limit=500, columns=None):
+    """
+    ``values()`` rows of every sync stream changed after ``token``, at most
+    ``limit`` per stream, and the token to ask for the next ones. ``columns``
+    maps a stream to the columns to read, all of them by default.
+
+    Each stream is read in ``(timestamp, id)`` order from an index that
+    starts with the user, so a sync costs O(changes). Only rows older than
+    ``SYNC_SETTLE_SECONDS`` are handed out: a row stamped earlier by a
+    transaction that had not committed yet would otherwise be skipped.
+
+    A token holds one instant for all streams, plus per stream the last id
+    handed out at exactly that instant. When a stream fills its page, every
+    stream stops at the timestamp of that page's last row, so deletions are
+    never handed out ahead of the rows they delete.
+
+    Without a token rows are synced from the beginning and deletions from
+    now, since the client has nothing to delete yet.
+    """
+    until = timezone.now() - timedelta(seconds=settle_seconds())
+    since, after = decode_token(user, token) if token else (None, {})
+    streams = sync_streams(user)
+
+    columns = columns or {}
+    pages = {}
+    for name, (queryset, field) in streams.items():
+        position = until if since is None and name == "deleted" else since
+        if name in columns:
+            queryset = queryset.values(*dict.fromkeys([*columns[name], "id", field]))
+        else:
+            queryset = queryset.values()
+        queryset = queryset.filter(**{f"{field}__lte": until})
+        if position is not None:
+            condition = Q(**{f"{field}__gt": position})
+            if position == since and name in after:
+                condition |= Q(**{field: position, "pk__gt": after[name]})
+            # The plain lower bound lets the database range scan the index.
+            queryset = queryset.filter(condition, **{f"{field}__gte": position})
+        pages[name] = list(queryset.order_by(field, "pk")[: limit + 1])
+
+    full = [
+        rows[limit - 1][streams[name][1]]
+        for name, rows in pages.items()
+        if len(rows) > limit
+    ]
+    if not full:
+        return {
+            **pages,
+            "deleted": supersede(pages),
+            "token": encode_token(user, until, {}),
+            "has_more": False,
+        }
+
+    # Stop every stream at the earliest timestamp a page ran out at. Rows
+    # before it were all read; rows at it are kept up to the page's end and
+    # the token remembers the last one.
+    cut = min(full)
+    next_after = {name: last for name, last in after.items() if since == cut}
+    for name, rows in pages.items():
+        field = streams[name][1]
+        rows = [row for row in rows[:limit] if row[field] <= cut]
+        if rows and rows[-1][field] == cut:
+            next_after[name] = str(rows[-1]["id"])
+        pages[name] = rows
+    return {
+        **pages,
+        "deleted": supersede(pages),
+        "token": encode_token(user, cut, next_after),
+        "has_more": True,
+    }
+
+
+def supersede(pages):
+    """
+    Tombstones not overtaken by a later change of the same row in this page,
+    e.g. a task assigned away and back again.
+    """
+    changed = {
+        row["id"]: row["modified_at"]
+        for row in (*pages["tasks"], *pages["submissions"])
+    }
+    return [
+        tombstone
+        for tombstone in pages["deleted"]
+        if changed.get(tombstone["object_id"], tombstone["deleted_at"])
+        <= tombstone["deleted_at"]
+    ]
@@ -1,3 +1,1874 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import re
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from assigner.models import (
+    User,
+    Project,
+    ProjectStats,
+    Task,
+    SubmittedTask,
+    Tombstone,
+)
+from assigner.services import review_submissions
+from common.authentication import (
+    CachedJWTAuthentication,
+    UserClaimsRefreshToken,
+    user_cache,
+)
+from common.cache import DjangoCache
+from common.filters import check_ordering_indexes, index_ordering
+from common.permissions import ROLE_PERMISSIONS, RolePermission
+from common.renderers import JSON_BACKENDS, FastJSONRenderer, load_json_backend
+from common.response_cache import ResponseCache, response_cache
+from common.search import (
+    SEARCH_DOCUMENTS,
+    get_search_backend,
+    install_missing_search_index,
+)
+from common.validators import VALIDATORS, validate
+
+
+class ListEndpointsMixin:
+    """
+    Page mode runs the validator aggregate (which doubles as the count) and
+    the page, or the count and the page where there are no validators
+    (project-summary); cursor mode only the page.
+    """
+
+    page_sizes = (1, 10)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Query Count", email="query.count@example.com", role="U"
+        )
+        cls.project = Project.objects.create(name="Project", description="Project")
+
+    def setUp(self):
+        response_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def seed(self, rows):
+        for index in range(rows):
+            project = Project.objects.create(
+                name=f"Project {index}", description="Project"
+            )
+            project.contributors.add(self.user)
+            task = Task.objects.create(
+                title=f"Task {index}",
+                description="Task",
+                project=project,
+                assignee=self.user,
+                creator=self.user,
+            )
+            SubmittedTask.objects.create(task=task, project=project, creator=self.user)
+
+    def test_project_list(self):
+        self.assertListQueries("/api/v1/project-list/", 2)
+
+    def test_project_list_cursor(self):
+        self.assertListQueries("/api/v1/project-list/", 1, pagination="cursor")
+
+    def test_project_summary(self):
+        self.assertListQueries("/api/v1/project-summary/", 2)
+
+    def test_project_summary_cursor(self):
+        self.assertListQueries("/api/v1/project-summary/", 1, pagination="cursor")
+
+    def test_task_list(self):
+        self.assertListQueries("/api/v1/task-list/", 2)
+
+    def test_task_list_cursor(self):
+        self.assertListQueries("/api/v1/task-list/", 1, pagination="cursor")
+
+    def test_project_list_filtered(self):
+        self.assertListQueries(
+            "/api/v1/project-list/",
+            2,
+            status="D",
+            created_after="2000-01-01T00:00:00",
+            ordering="-created_at",
+        )
+
+    def test_task_list_filtered(self):
+        self.assertListQueries(
+            "/api/v1/task-list/", 2, status="D", ordering="-created_at"
+        )
+
+    def test_task_list_ordered_by_status(self):
+        self.assertListQueries("/api/v1/task-list/", 2, ordering="-status")
+
+    def test_task_list_ordered_by_status_cursor(self):
+        self.assertListQueries(
+            "/api/v1/task-list/", 1, pagination="cursor", ordering="status"
+        )
+
+    def test_project_list_ordered_by_modified_at_cursor(self):
+        self.assertListQueries(
+            "/api/v1/project-list/", 1, pagination="cursor", ordering="modified_at"
+        )
+
+    def test_project_summary_ordered_by_modified_at(self):
+        self.assertListQueries("/api/v1/project-summary/", 2, ordering="-modified_at")
+
+    def test_task_submitted_list_ordered_by_modified_at_cursor(self):
+        self.assertListQueries(
+            "/api/v1/task-submitted-list/",
+            1,
+            pagination="cursor",
+            ordering="-modified_at",
+        )
+
+    def test_task_submitted_list(self):
+        self.assertListQueries("/api/v1/task-submitted-list/", 2)
+
+    def test_task_submitted_list_filtered(self):
+        self.assertListQueries("/api/v1/task-submitted-list/", 2, is_approved="false")
+
+    def test_task_submitted_list_cursor(self):
+        self.assertListQueries("/api/v1/task-submitted-list/", 1, pagination="cursor")
+
+    def test_task_list_fields(self):
+        self.assertListQueries("/api/v1/task-list/", 2, fields="id,title,status")
+
+    def test_task_list_fields_cursor(self):
+        self.assertListQueries(
+            "/api/v1/task-list/", 1, pagination="cursor", fields="id,title"
+        )
+
+    def test_project_summary_fields(self):
+        self.assertListQueries("/api/v1/project-summary/", 2, fields="id,name")
+
+
+class ListQueryCountTests(ListEndpointsMixin, TestCase):
+    """
+    Every list endpoint must run the same number of queries whether the page
+    holds one row or a full page of rows.
+    """
+
+    def assertListQueries(self, url, num, **params):
+        seeded = 0
+        for page_size in self.page_sizes:
+            self.seed(page_size - seeded)
+            seeded = page_size
+            with self.assertNumQueries(num):
+                response = self.client.get(url, {**params, "limit": page_size})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["data"]["docs"]), page_size)
+
+    def test_submitted_task_admin_changelist(self):
+        admin = User.objects.create(
+            full_name="Admin", email="admin@example.com", role="SU"
+        )
+        self.client.force_login(admin)
+        counts = []
+        seeded = 0
+        for rows in self.page_sizes:
+            self.seed(rows - seeded)
+            seeded = rows
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/db/admin/assigner/submittedtask/")
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(queries))
+        self.assertEqual(len(set(counts)), 1, counts)
+
+
+class ListIndexUsageTests(ListEndpointsMixin, TestCase):
+    """
+    The queries behind every list endpoint must be served from an index, never
+    by scanning the whole table.
+    """
+
+    def explain(self, sql, params):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN {sql}", params)
+            else:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+
+    def assertListQueries(self, url, num, **params):
+        self.seed(self.page_sizes[-1])
+        statements = []
+
+        def capture(execute, sql, sql_params, many, context):
+            statements.append((sql, sql_params))
+            return execute(sql, sql_params, many, context)
+
+        with connection.execute_wrapper(capture):
+            response = self.client.get(url, {**params, "limit": 5})
+            cursor = response.data["data"]["pagination"]["next"]
+            if cursor:
+                response = self.client.get(cursor)
+        self.assertEqual(response.status_code, 200)
+
+        for sql, sql_params in statements:
+            if not sql.startswith("SELECT"):
+                continue
+            plan = self.explain(sql, sql_params)
+            for line in plan:
+                self.assertNotIn("Seq Scan", line, (sql, plan))
+                self.assertIsNone(re.match(r"^SCAN \S+$", line), (sql, plan))
+                # Neither a full sort nor a sort of the tie-breakers.
+                self.assertNotIn("TEMP B-TREE", line, (sql, plan))
+                self.assertNotRegex(line, r"^(\s*->)?\s*(Incremental )?Sort\b")
+
+    def test_ordering_indexes(self):
+        self.assertEqual(
+            index_ordering(Task, "status", ("assignee",)),
+            ("status", "created_at", "id"),
+        )
+        self.assertEqual(index_ordering(Project, "modified_at"), ("modified_at", "id"))
+        # A single-column index leaves ties to a sort.
+        self.assertIsNone(index_ordering(Task, "modified_at"))
+        self.assertEqual(check_ordering_indexes(None), [])
+
+
+class CursorPaginationTests(TestCase):
+    """
+    Cursor pages walk the whole list in both directions, one page at a time,
+    at the same cost however deep the page is.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Cursor", email="cursor@example.com", role="U"
+        )
+        for index in range(12):
+            project = Project.objects.create(
+                name=f"Project {index}", description="Project"
+            )
+            task = Task.objects.create(
+                title=f"Task {index}",
+                description="Task",
+                project=project,
+                assignee=cls.user,
+                creator=cls.user,
+            )
+            SubmittedTask.objects.create(task=task, project=project, creator=cls.user)
+        # Ties on created_at are broken by id.
+        created_at = Task.objects.earliest("created_at").created_at
+        for model in (Project, Task, SubmittedTask):
+            model.objects.update(created_at=created_at)
+
+    def setUp(self):
+        response_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, model):
+        with self.assertNumQueries(1):
+            data = self.client.get(url, {"pagination": "cursor", "limit": 5}).data
+        pages = [data["data"]]
+        while pages[-1]["pagination"]["next"]:
+            with self.assertNumQueries(1):
+                data = self.client.get(pages[-1]["pagination"]["next"]).data
+            pages.append(data["data"])
+        ids = [doc["id"] for page in pages for doc in page["docs"]]
+        expected = model.objects.order_by("-created_at", "-id").values_list("id")
+        self.assertEqual(ids, [str(pk) for pk, in expected])
+        self.assertEqual([page["pagination"]["count"] for page in pages], [None] * 3)
+
+        backwards = [pages[-1]]
+        while backwards[-1]["pagination"]["previous"]:
+            data = self.client.get(backwards[-1]["pagination"]["previous"]).data
+            backwards.append(data["data"])
+        self.assertEqual(
+            [[doc["id"] for doc in page["docs"]] for page in reversed(backwards)],
+            [[doc["id"] for doc in page["docs"]] for page in pages],
+        )
+
+    def test_project_list(self):
+        self.walk("/api/v1/project-list/", Project)
+
+    def test_task_list(self):
+        self.walk("/api/v1/task-list/", Task)
+
+    def test_task_submitted_list(self):
+        self.walk("/api/v1/task-submitted-list/", SubmittedTask)
+
+    def test_invalid_cursor(self):
+        for cursor in ("zzz", "eyJwIjogWzFdfQ=="):
+            response = self.client.get("/api/v1/task-list/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 422)
+            self.assertEqual(response.data["title"], "Pagination")
+
+
+class ReferenceResolutionTests(TestCase):
+    """
+    Each referenced row is loaded once, by validation, and reused on save.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create(full_name="HR", email="hr@example.com", role="HR")
+        cls.user = User.objects.create(
+            full_name="Assignee", email="assignee@example.com", role="U"
+        )
+        cls.project = Project.objects.create(name="Project", description="Project")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.hr)
+
+    def payload(self, **data):
+        return {
+            "title": "Task",
+            "description": "Task",
+            "project": str(self.project.pk),
+            "assignee": str(self.user.pk),
+            **data,
+        }
+
+    def test_task_create(self):
+        # Project, assignee, the INSERT with creator set and the stats row.
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                "/api/v1/task-create/", self.payload(), format="json"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(Task.objects.get().creator, self.hr)
+
+    def test_task_create_unknown_references(self):
+        for field, message in (
+            ("project", "Project does not exist."),
+            ("assignee", "Assignee does not exist."),
+        ):
+            with self.assertNumQueries(2):
+                response = self.client.post(
+                    "/api/v1/task-create/",
+                    self.payload(**{field: str(uuid.uuid4())}),
+                    format="json",
+                )
+            self.assertEqual(response.status_code, 422)
+            self.assertEqual(response.data["message"], message)
+        self.assertFalse(Task.objects.exists())
+
+    def test_submit_task(self):
+        task = Task.objects.create(
+            title="Task", project=self.project, assignee=self.user, creator=self.hr
+        )
+        self.client.force_authenticate(self.user)
+        payload = {"task": str(task.pk), "project": str(self.project.pk)}
+        # Task, project, the INSERT and the stats row.
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                "/api/v1/task-submitting-create/", payload, format="json"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(SubmittedTask.objects.get().creator, self.user)
+
+        payload["task"] = str(self.project.pk)
+        response = self.client.post(
+            "/api/v1/task-submitting-create/", payload, format="json"
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.data["message"], "Task does not exist.")
+
+
+class TaskBulkCreateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create(
+            full_name="Bulk", email="bulk@example.com", role="HR"
+        )
+        cls.user = User.objects.create(
+            full_name="Bulk Assignee", email="bulk.assignee@example.com", role="U"
+        )
+        cls.project = Project.objects.create(name="Project", description="Project")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.hr)
+
+    def item(self, **data):
+        return {
+            "title": "Task",
+            "description": "Task",
+            "project": str(self.project.pk),
+            "assignee": str(self.user.pk),
+            **data,
+        }
+
+    def post(self, data):
+        return self.client.post("/api/v1/task-bulk-create/", data, format="json")
+
+    def test_one_insert(self):
+        items = [self.item(title=f"Task {index}") for index in range(20)]
+        # Projects and assignees, then the savepoint around the INSERT and
+        # the stats UPDATE.
+        with self.assertNumQueries(6):
+            response = self.post(items)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(len(response.data["data"]), 20)
+        self.assertEqual(Task.objects.filter(creator=self.hr).count(), 20)
+        self.assertEqual(ProjectStats.objects.get(pk=self.project.pk).tasks_draft, 20)
+
+    def test_errors_by_index(self):
+        items = [
+            self.item(),
+            self.item(title=""),
+            "task",
+            self.item(project=str(uuid.uuid4())),
+            self.item(assignee="nope"),
+        ]
+        with self.assertNumQueries(2):
+            response = self.post(items)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(
+            response.data["errors"],
+            {
+                1: "Title is required and cannot be empty.",
+                2: "Invalid task.",
+                3: "Project does not exist.",
+                4: "Invalid assignee.",
+            },
+        )
+        self.assertFalse(Task.objects.exists())
+
+    def test_field_errors_by_index(self):
+        response = self.post([self.item(), self.item(title="x" * 101)])
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(
+            response.data["errors"],
+            {1: "title: Ensure this field has no more than 100 characters."},
+        )
+        self.assertFalse(Task.objects.exists())
+
+    def test_batch_limits(self):
+        for data in ([], {"title": "Task"}, [self.item()] * 501):
+            response = self.post(data)
+            self.assertEqual(response.status_code, 422)
+        self.assertFalse(Task.objects.exists())
+
+
+class ProjectContributorsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create(
+            full_name="Contributors", email="contributors@example.com", role="HR"
+        )
+        cls.users = [
+            User.objects.create(
+                full_name=f"Contributor {index}",
+                email=f"contributor{index}@example.com",
+            )
+            for index in range(8)
+        ]
+        cls.project = Project.objects.create(name="Project", description="Project")
+        cls.project.contributors.add(*cls.users[:5])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.hr)
+
+    def ids(self, users):
+        return [str(user.pk) for user in users]
+
+    def patch(self, data):
+        return self.client.patch(
+            f"/api/v1/project-contributors/{self.project.pk}/", data, format="json"
+        )
+
+    def diff(self, response):
+        self.assertEqual(response.status_code, 200, response.data)
+        data = response.data["data"]
+        return [str(pk) for pk in data["added"]], [str(pk) for pk in data["removed"]]
+
+    def contributors(self):
+        return set(self.ids(self.project.contributors.all()))
+
+    def test_add_and_remove(self):
+        # The project, one IN query for the added users, one read of the
+        # through table, then the DELETE and INSERT in a savepoint.
+        with self.assertNumQueries(7):
+            response = self.patch(
+                {"add": self.ids(self.users[3:8]), "remove": self.ids(self.users[:2])}
+            )
+        self.assertEqual(
+            self.diff(response),
+            (sorted(self.ids(self.users[5:])), sorted(self.ids(self.users[:2]))),
+        )
+        self.assertEqual(self.contributors(), set(self.ids(self.users[2:])))
+
+    def test_replace(self):
+        response = self.patch({"replace": self.ids(self.users[4:6])})
+        self.assertEqual(
+            self.diff(response),
+            (self.ids(self.users[5:6]), sorted(self.ids(self.users[:4]))),
+        )
+        self.assertEqual(self.contributors(), set(self.ids(self.users[4:6])))
+
+    def test_unchanged(self):
+        with self.assertNumQueries(3):
+            response = self.patch({"add": self.ids(self.users[:2])})
+        self.assertEqual(self.diff(response), ([], []))
+
+    def test_project_edit_replaces_contributors(self):
+        response = self.client.patch(
+            f"/api/v1/project-edit/{self.project.pk}/",
+            {"contributors": self.ids(self.users[6:])},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.contributors(), set(self.ids(self.users[6:])))
+
+    def test_invalid(self):
+        for data, message in (
+            (
+                {"add": self.ids(self.users[5:7]), "remove": self.ids(self.users[6:])},
+                "A contributor cannot be both added and removed.",
+            ),
+            (
+                {"replace": [], "add": self.ids(self.users[5:6])},
+                "Replace cannot be combined with add or remove.",
+            ),
+            ({}, "One of add, remove or replace is required."),
+            ({"add": ["nope"]}, "Invalid contributors"),
+            ({"add": [str(self.project.pk)]}, "Contributors do not exist"),
+        ):
+            response = self.patch(data)
+            self.assertEqual(response.status_code, 422)
+            self.assertEqual(response.data["message"], message)
+        self.assertEqual(self.contributors(), set(self.ids(self.users[:5])))
+
+
+class SlugAllocationTests(TestCase):
+    def create(self, full_name, index, **fields):
+        return User.objects.create(
+            full_name=full_name, email=f"slug{index}@example.com", **fields
+        )
+
+    def test_counted_per_name(self):
+        # The counter upsert, then the INSERT in its savepoint.
+        with self.assertNumQueries(4):
+            first = self.create("Sita Sharma", 1)
+        with self.assertNumQueries(4):
+            second = self.create("Sita Sharma", 2)
+        self.assertEqual([first.slug, second.slug], ["sita-sharma", "sita-sharma--2"])
+
+    def test_retries_taken_slug(self):
+        self.create("Old", 1, slug="sita--2")
+        slugs = [self.create("Sita", index).slug for index in (2, 3)]
+        self.assertEqual(slugs, ["sita", "sita--3"])
+
+    def test_other_integrity_errors_raise(self):
+        self.create("Sita", 1)
+        user = User(full_name="Sita", email="slug1@example.com")
+        with self.assertRaises(IntegrityError):
+            user.save()
+        self.assertIsNone(user.slug)
+
+    def test_long_and_empty_names(self):
+        max_length = User._meta.get_field("slug").max_length
+        slugs = [self.create("a" * 80, index).slug for index in (1, 2)]
+        self.assertEqual(slugs[1], f"{slugs[0]}--2")
+        self.assertLessEqual(len(slugs[1]), max_length)
+        self.assertTrue(self.create("", 3).slug)
+
+    def test_partial_save_writes_allocated_slug(self):
+        user = self.create("Sita", 1)
+        User.objects.filter(pk=user.pk).update(slug=None)
+        user.slug = None
+        user.set_password("HIGHspeed12@")
+        user.save(update_fields=["password"])
+        user.refresh_from_db()
+        self.assertEqual(user.slug, "sita--2")
+        self.assertTrue(user.check_password("HIGHspeed12@"))
+
+
+class ValidatorTests(TestCase):
+    def test_registry(self):
+        self.assertEqual(set(VALIDATORS), {"password", "phone", "email", "url", "uuid"})
+        samples = {
+            "password": ("HIGHspeed12@", "highspeed"),
+            "phone": ("9809461773", "12345"),
+            "email": ("ram@example.com", "ram@"),
+            "url": ("https://example.com/a.png", "example"),
+            "uuid": (str(uuid.uuid4()), str(uuid.uuid4())[:-1] + "g"),
+        }
+        for name, (valid, invalid) in samples.items():
+            self.assertTrue(validate(name, valid), name)
+            self.assertFalse(validate(name, invalid), name)
+            self.assertFalse(validate(name, None), name)
+        self.assertFalse(validate("uuid", uuid.uuid4()))
+
+    def test_registration_rejects_without_queries(self):
+        payload = {
+            "full_name": "Ram Bahadur",
+            "phone": "9809461773",
+            "email": "ram@example.com",
+            "password": "HIGHspeed12@",
+            "profile_pic": "",
+        }
+        for field, value in (
+            ("password", "weak"),
+            ("profile_pic", "example"),
+            ("phone", "12345"),
+            ("email", "ram@"),
+        ):
+            with self.assertNumQueries(0):
+                response = APIClient().post(
+                    "/api/v1/account-registration/",
+                    {**payload, field: value},
+                    format="json",
+                )
+            self.assertEqual(response.status_code, 422, field)
+
+    def test_edit_rejects_malformed_ids_without_queries(self):
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create(full_name="HR", email="hr@example.com", role="HR")
+        )
+        for url in (
+            "/api/v1/project-edit/nope/",
+            "/api/v1/task-edit/nope/",
+            "/api/v1/task-submitted-edit/nope/",
+        ):
+            with self.assertNumQueries(0):
+                response = client.patch(url, {}, format="json")
+            self.assertEqual(response.status_code, 422, url)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["common.hashers.TunablePBKDF2PasswordHasher"],
+    PASSWORD_HASHER_ITERATIONS=1000,
+)
+class LoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User(
+            full_name="Login", email="login@example.com", phone="9809461773"
+        )
+        cls.user.set_password("HIGHspeed12@")
+        cls.user.save()
+
+    def login(self, **data):
+        return APIClient().post(
+            "/api/v1/login/", {"password": "HIGHspeed12@", **data}, format="json"
+        )
+
+    def test_one_lookup(self):
+        for credentials in ({"email": "login@example.com"}, {"phone": "9809461773"}):
+            with self.assertNumQueries(1):
+                response = self.login(**credentials)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertEqual(response.data["data"]["id"], str(self.user.pk))
+            self.assertIn("access", response.data["data"])
+
+    def test_rehash_on_new_work_factor(self):
+        with override_settings(PASSWORD_HASHER_ITERATIONS=2000):
+            # The lookup, then the UPDATE with the rehashed password.
+            with self.assertNumQueries(2):
+                response = self.login(email="login@example.com")
+            self.assertEqual(response.status_code, 200, response.data)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+            with self.assertNumQueries(1):
+                self.login(email="login@example.com")
+
+    def test_rejected(self):
+        for data, message in (
+            (
+                {"email": "login@example.com", "password": "Wrong12@pass"},
+                "Incorrect Password!",
+            ),
+            ({"email": "nobody@example.com"}, "Email or Phone does not exist!"),
+        ):
+            with self.assertNumQueries(1):
+                response = self.login(**data)
+            self.assertEqual(response.status_code, 422)
+            self.assertEqual(response.data["message"], message)
+
+
+class CachedAuthenticationTests(TestCase):
+    """
+    Users resolved from a JWT are cached until they are written, whether by
+    save() or by a queryset update().
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Token", email="token@example.com", role="A"
+        )
+
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        token = UserClaimsRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def get(self):
+        # cache-stats runs no queries of its own.
+        return self.client.get("/api/v1/cache-stats/")
+
+    def test_cached_until_saved(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get().status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get().status_code, 200)
+        user = User.objects.get(pk=self.user.pk)
+        user.full_name = "Renamed"
+        user.save()
+        with self.assertNumQueries(1):
+            self.get()
+
+    def test_blocked_by_save(self):
+        self.get()
+        user = User.objects.get(pk=self.user.pk)
+        user.is_blocked = True
+        user.save()
+        self.assertEqual(self.get().status_code, 417)
+
+    def test_blocked_by_update(self):
+        self.get()
+        User.objects.filter(pk=self.user.pk).update(is_blocked=True)
+        self.assertEqual(self.get().status_code, 417)
+        User.objects.filter(pk=self.user.pk).update(is_blocked=False, role="U")
+        self.assertEqual(self.get().status_code, 401)
+
+    @override_settings(JWT_TRUST_USER_CLAIMS=True)
+    def test_trusted_claims(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get().status_code, 200)
+
+    def test_copy_per_request(self):
+        authentication = CachedJWTAuthentication()
+        token = UserClaimsRefreshToken.for_user(self.user).access_token
+        first = authentication.get_user(token)
+        first.full_name = "Changed by a view"
+        with self.assertNumQueries(0):
+            second = authentication.get_user(token)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.full_name, "Token")
+
+
+class RolePermissionMatrixTests(TestCase):
+    """
+    Walks every role-scoped endpoint with every role: denied roles get a 401
+    with the scope's message, and OPTIONS is open to all of them.
+    """
+
+    ROLES = ("SA", "A", "U", "SU", "HR")
+    HR = ("HR",)
+    HR_SU = ("HR", "SU")
+    ENDPOINTS = (
+        ("project-create/", "post", HR, "human resource"),
+        ("project-list/", "get", ROLES, None),
+        ("project-summary/", "get", ROLES, None),
+        ("project-search/?q=alpha", "get", ROLES, None),
+        ("project-edit/{pk}/", "patch", HR, "human resource"),
+        ("project-contributors/{pk}/", "patch", HR, "human resource"),
+        ("task-create/", "post", HR_SU, "HR Supervisor"),
+        ("task-bulk-create/", "post", HR_SU, "HR Supervisor"),
+        ("task-edit/{pk}/", "patch", HR_SU, "HR Supervisor"),
+        ("task-list/", "get", ROLES, None),
+        ("task-search/?q=alpha", "get", ROLES, None),
+        ("task-submitting-create/", "post", ROLES, None),
+        ("task-submitted-edit/{pk}/", "patch", HR_SU, "HR Supervisor"),
+        ("task-submitted-bulk-edit/", "patch", HR_SU, "HR Supervisor"),
+        ("task-submitted-list/", "get", ROLES, None),
+        ("task-submitted-export/", "get", HR_SU, "HR Supervisor"),
+        ("cache-stats/", "get", ("SA", "A"), "super admin"),
+        ("sync/", "get", ROLES, None),
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            role: User.objects.create(
+                full_name=role, email=f"{role.lower()}@example.com", role=role
+            )
+            for role in cls.ROLES
+        }
+
+    def request(self, role, method, path):
+        client = APIClient()
+        client.force_authenticate(self.users[role])
+        url = "/api/v1/" + path.format(pk=uuid.uuid4())
+        return getattr(client, method)(url, {}, format="json")
+
+    def test_matrix(self):
+        for path, method, allowed, name in self.ENDPOINTS:
+            for role in self.ROLES:
+                with self.subTest(path=path, role=role):
+                    response = self.request(role, method, path)
+                    if role in allowed:
+                        self.assertNotEqual(response.status_code, 401)
+                        continue
+                    self.assertEqual(response.status_code, 401)
+                    self.assertEqual(
+                        response.data["message"],
+                        f"Not authenticated for {name} request",
+                    )
+
+    def test_head_follows_get(self):
+        response = self.request("U", "head", "cache-stats/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(
+            response.data["message"], "Not authenticated for super admin request"
+        )
+
+    def test_options(self):
+        # Views that narrow http_method_names answer 405 after the permission
+        # check, the create views describe themselves.
+        for path, method, allowed, name in self.ENDPOINTS:
+            for role in self.ROLES:
+                with self.subTest(path=path, role=role):
+                    response = self.request(role, "options", path)
+                    self.assertEqual(
+                        response.status_code, 200 if method == "post" else 405
+                    )
+
+    def test_unlisted_method(self):
+        for role in self.ROLES:
+            response = self.request(role, "delete", "project-edit/{pk}/")
+            self.assertEqual(response.status_code, 405, role)
+
+    def test_matrix_lists_every_handled_method(self):
+        # Methods missing from the matrix are let through to DRF's 405, so a
+        # view must not handle one the matrix does not list.
+        for pattern in get_resolver("assigner.urls").url_patterns:
+            view = getattr(pattern.callback, "cls", None)
+            if view is None or RolePermission not in view.permission_classes:
+                continue
+            handled = {
+                method.upper()
+                for method in view.http_method_names
+                if hasattr(view, method) and method not in ("head", "options")
+            }
+            self.assertLessEqual(
+                handled, set(ROLE_PERMISSIONS[view.permission_scope]), view
+            )
+
+
+class ProjectStatsTests(TestCase):
+    """
+    The counters moved by the signal receivers always match what
+    ProjectStats.rebuild() computes from the source tables.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Stats", email="stats@example.com", role="HR"
+        )
+        cls.project = Project.objects.create(name="Alpha", description="a")
+        cls.other = Project.objects.create(name="Beta", description="b")
+
+    def counters(self):
+        return {
+            stats.project_id: [getattr(stats, name) for name in ProjectStats.COUNTERS]
+            for stats in ProjectStats.objects.all()
+        }
+
+    def assertRebuilt(self):
+        moved = self.counters()
+        ProjectStats.rebuild()
+        self.assertEqual(moved, self.counters())
+
+    def create_task(self, project=None, **kwargs):
+        return Task.objects.create(
+            title="Task",
+            description="d",
+            project=project or self.project,
+            assignee=self.user,
+            **kwargs,
+        )
+
+    def submit(self, task):
+        return SubmittedTask.objects.create(
+            task=task, project=task.project, creator=self.user
+        )
+
+    def test_create(self):
+        self.create_task()
+        self.create_task(status="C")
+        self.submit(self.create_task(status="O"))
+        self.assertEqual(self.counters()[self.project.pk], [1, 1, 1, 1])
+        self.assertRebuilt()
+
+    def test_edit(self):
+        task = self.create_task()
+        task = Task.objects.get(pk=task.pk)
+        task.status = "C"
+        task.save()
+        self.assertEqual(self.counters()[self.project.pk], [0, 0, 1, 0])
+        self.assertRebuilt()
+
+    def test_move(self):
+        task = Task.objects.get(pk=self.create_task().pk)
+        task.project = self.other
+        task.save()
+        self.assertEqual(self.counters()[self.project.pk], [0, 0, 0, 0])
+        self.assertEqual(self.counters()[self.other.pk], [1, 0, 0, 0])
+        self.assertRebuilt()
+
+    def test_approve(self):
+        first = self.submit(self.create_task())
+        second = self.submit(self.create_task())
+        review_submissions([first.pk], self.user, is_approved=True)
+        self.assertEqual(self.counters()[self.project.pk], [1, 1, 0, 1])
+        self.assertRebuilt()
+        review_submissions([first.pk, second.pk], self.user, is_approved=False)
+        self.assertEqual(self.counters()[self.project.pk], [0, 2, 0, 2])
+        self.assertRebuilt()
+
+    def test_delete(self):
+        task = self.create_task()
+        self.submit(task)
+        self.submit(self.create_task(status="O"))
+        Task.objects.get(pk=task.pk).delete()
+        self.assertEqual(self.counters()[self.project.pk], [0, 1, 0, 1])
+        self.assertRebuilt()
+
+    def test_project_delete(self):
+        # The cascade writes no stats and one tombstone insert for the lot,
+        # whatever the number of tasks and submissions.
+        for _ in range(5):
+            self.submit(self.create_task())
+        self.submit(self.create_task(project=self.other))
+        with CaptureQueriesContext(connection) as queries:
+            self.project.delete()
+        statements = [query["sql"].split()[0] for query in queries]
+        self.assertEqual(statements.count("INSERT"), 1)
+        self.assertEqual(statements.count("UPDATE"), 0)
+        self.assertEqual(Tombstone.objects.filter(user=self.user).count(), 10)
+        self.assertEqual(list(self.counters()), [self.other.pk])
+        self.assertRebuilt()
+
+
+class ReviewSubmissionsTests(TestCase):
+    """
+    Reviewing a submission moves it and its task, records who reviewed it,
+    and moves the project counters to match.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Reviewer", email="reviewer@example.com", role="SU"
+        )
+        cls.project = Project.objects.create(name="Alpha", description="a")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def submit(self, status="D"):
+        task = Task.objects.create(
+            title="Task", description="d", project=self.project, status=status
+        )
+        return SubmittedTask.objects.create(
+            task=task, project=self.project, creator=self.user
+        )
+
+    def counters(self):
+        stats = ProjectStats.objects.get(pk=self.project.pk)
+        return {name: getattr(stats, name) for name in ProjectStats.COUNTERS}
+
+    def edit(self, submission, is_approved):
+        return self.client.patch(
+            f"/api/v1/task-submitted-edit/{submission.pk}/",
+            {"is_approved": is_approved},
+            format="json",
+        )
+
+    def test_approve(self):
+        submission = self.submit()
+        response = self.edit(submission, True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["is_approved"], True)
+        submission.refresh_from_db()
+        self.assertTrue(submission.is_approved)
+        self.assertEqual(submission.modifier, self.user)
+        self.assertEqual(submission.task.status, "O")
+        self.assertEqual(submission.task.modifier, self.user)
+        self.assertEqual(
+            self.counters(),
+            {
+                "tasks_draft": 0,
+                "tasks_ongoing": 1,
+                "tasks_completed": 0,
+                "pending_approvals": 0,
+            },
+        )
+
+    def test_reject_approved(self):
+        submission = self.submit(status="C")
+        self.edit(submission, True)
+        self.assertEqual(self.counters()["pending_approvals"], 0)
+        response = self.edit(submission, False)
+        self.assertEqual(response.status_code, 200)
+        submission.refresh_from_db()
+        self.assertFalse(submission.is_approved)
+        self.assertEqual(
+            self.counters(),
+            {
+                "tasks_draft": 0,
+                "tasks_ongoing": 1,
+                "tasks_completed": 0,
+                "pending_approvals": 1,
+            },
+        )
+
+    def test_reject_pending(self):
+        # Already pending: the counters stay, the task still goes ongoing.
+        submission = self.submit()
+        self.edit(submission, False)
+        self.assertEqual(self.counters()["pending_approvals"], 1)
+        self.assertEqual(self.counters()["tasks_ongoing"], 1)
+
+    def test_remarks(self):
+        first, second = self.submit(), self.submit()
+        reviewed = review_submissions(
+            [first.pk, second.pk], self.user, is_approved=True, remarks="Good"
+        )
+        self.assertEqual(set(reviewed), {first.pk, second.pk})
+        for submission in SubmittedTask.objects.all():
+            self.assertEqual(submission.remarks, "Good")
+            self.assertEqual(submission.modifier, self.user)
+        # Left as they are when no remarks are given.
+        review_submissions([first.pk], self.user, is_approved=False)
+        first.refresh_from_db()
+        self.assertEqual(first.remarks, "Good")
+
+    def test_missing(self):
+        self.assertEqual(review_submissions([uuid.uuid4()], self.user, True), {})
+        response = self.edit(SubmittedTask(pk=uuid.uuid4()), True)
+        self.assertEqual(response.status_code, 422)
+
+    def test_queries(self):
+        # SAVEPOINT, the locked SELECT from get_object(), the submission and
+        # task UPDATEs, the stats UPDATE and RELEASE.
+        submission = self.submit()
+        with CaptureQueriesContext(connection) as queries:
+            self.edit(submission, True)
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+        self.assertEqual(len(queries), 6)
+        # An approved task that is already ongoing is not written again.
+        with self.assertNumQueries(5):
+            self.edit(submission, False)
+
+
+class SubmissionBulkEditTests(TestCase):
+    """
+    The bulk edit reviews every valid id in one pass and reports the
+    outcome of each id it was given.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Bulk", email="bulk@example.com", role="HR"
+        )
+        cls.project = Project.objects.create(name="Alpha", description="a")
+        task = Task.objects.create(title="Task", description="d", project=cls.project)
+        cls.submissions = [
+            SubmittedTask.objects.create(
+                task=task, project=cls.project, creator=cls.user
+            )
+            for _ in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def patch(self, **data):
+        return self.client.patch(
+            "/api/v1/task-submitted-bulk-edit/", data, format="json"
+        )
+
+    def test_approved(self):
+        ids = [str(submission.pk) for submission in self.submissions]
+        response = self.patch(ids=ids, is_approved=True, remarks="Fine")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["data"]["results"], dict.fromkeys(ids, "approved")
+        )
+        self.assertEqual(
+            SubmittedTask.objects.filter(is_approved=True, remarks="Fine").count(), 3
+        )
+        stats = ProjectStats.objects.get(pk=self.project.pk)
+        self.assertEqual(stats.pending_approvals, 0)
+
+    def test_mixed(self):
+        found = str(self.submissions[0].pk)
+        missing = str(uuid.uuid4())
+        response = self.patch(
+            ids=[found, "not-a-uuid", missing, found], is_approved=False
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["data"]["results"],
+            {found: "rejected", "not-a-uuid": "invalid", missing: "not_found"},
+        )
+        self.assertEqual(SubmittedTask.objects.filter(modifier=self.user).count(), 1)
+
+    def test_nothing_found(self):
+        # No valid id: no transaction and no writes.
+        with self.assertNumQueries(0):
+            response = self.patch(ids=["bad"], is_approved=True)
+        self.assertEqual(response.data["data"]["results"], {"bad": "invalid"})
+
+    def test_queries(self):
+        # SAVEPOINT, the locked SELECT, the submission and task UPDATEs, the
+        # stats UPDATE and RELEASE, whatever the number of ids.
+        ids = [str(submission.pk) for submission in self.submissions]
+        with self.assertNumQueries(6):
+            self.patch(ids=ids, is_approved=True)
+
+    def test_limits(self):
+        for data, message in (
+            ({"is_approved": True}, "A non-empty list of ids is required."),
+            ({"ids": [], "is_approved": True}, "A non-empty list of ids is required."),
+            (
+                {"ids": [str(uuid.uuid4())] * 501, "is_approved": True},
+                "At most 500 submissions can be edited at once.",
+            ),
+            (
+                {"ids": [str(uuid.uuid4())]},
+                "Is approved is required and must be true or false.",
+            ),
+            (
+                {"ids": [str(uuid.uuid4())], "is_approved": True, "remarks": 1},
+                "Invalid remarks.",
+            ),
+        ):
+            with self.subTest(message=message):
+                response = self.patch(**data)
+                self.assertEqual(response.status_code, 422)
+                self.assertEqual(response.data["message"], message)
+        response = self.patch(ids=[str(uuid.uuid4())] * 500, is_approved=True)
+        self.assertEqual(response.status_code, 200)
+
+
+class EditQueryCountTests(TestCase):
+    """
+    Edit views load the object once, with the relations the payload usually
+    repeats, and write only the columns that changed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Editor", email="editor@example.com", role="HR"
+        )
+        cls.assignee = User.objects.create(
+            full_name="Assignee", email="assignee@example.com", role="U"
+        )
+        cls.other = User.objects.create(
+            full_name="Other", email="other@example.com", role="U"
+        )
+        cls.project = Project.objects.create(name="Alpha", description="a")
+        cls.task = Task.objects.create(
+            title="Task", description="d", project=cls.project, assignee=cls.assignee
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def edit_task(self, **data):
+        payload = {
+            "title": "Task",
+            "description": "d",
+            "project": str(self.project.pk),
+            "assignee": str(self.assignee.pk),
+            **data,
+        }
+        response = self.client.patch(
+            f"/api/v1/task-edit/{self.task.pk}/", payload, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_task_unchanged(self):
+        # The project and assignee come with the task: no lookups, no UPDATE.
+        with self.assertNumQueries(1):
+            self.edit_task()
+
+    def test_task_changed(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.edit_task(title="Renamed")
+        self.assertEqual(len(queries), 2)
+        update = queries[1]["sql"]
+        self.assertTrue(update.startswith("UPDATE"))
+        self.assertIn('"title"', update)
+        self.assertNotIn('"description"', update)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Renamed")
+
+    def test_task_reassigned(self):
+        # The task, the new assignee, the UPDATE and the previous assignee's
+        # tombstone.
+        with self.assertNumQueries(4):
+            self.edit_task(assignee=str(self.other.pk))
+
+    def test_project(self):
+        # The project, the UPDATE, then its contributors for the response.
+        url = f"/api/v1/project-edit/{self.project.pk}/"
+        with self.assertNumQueries(3):
+            response = self.client.patch(url, {"name": "Beta"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(2):
+            self.client.patch(url, {"name": "Beta"}, format="json")
+
+    def test_missing(self):
+        with self.assertNumQueries(1):
+            response = self.client.patch(
+                f"/api/v1/task-edit/{uuid.uuid4()}/", {}, format="json"
+            )
+        self.assertEqual(response.status_code, 422)
+
+
+class JSONRendererTests(TestCase):
+    """
+    Every JSON backend escapes what DRF's renderer escapes, and nothing else.
+    """
+
+    data = {
+        "title": "a/b \u2028 c \u2029 d",
+        "name": 'Rāmesh "quoted" \\ back',
+        "items": [1, 2.5, None, True],
+    }
+
+    def test_backends(self):
+        expected = JSONRenderer().render(self.data)
+        self.assertIn(b"a/b \\u2028 c \\u2029 d", expected)
+        for name in JSON_BACKENDS:
+            loaded, dumps, loads = load_json_backend([name])
+            if loaded != name:
+                continue
+            with self.subTest(backend=name):
+                self.assertEqual(dumps(self.data), expected)
+                self.assertEqual(loads(dumps(self.data)), self.data)
+
+    def test_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+
+class SparseFieldsetTests(TestCase):
+    """
+    ``?fields=`` narrows the selected columns as well as the output.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Fields", email="fields@example.com", role="U"
+        )
+        cls.project = Project.objects.create(name="Alpha", description="a")
+        Task.objects.create(
+            title="Task", description="d", project=cls.project, assignee=cls.user
+        )
+
+    def setUp(self):
+        response_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data["data"]["docs"], queries[-1]["sql"]
+
+    def test_task_list(self):
+        docs, sql = self.get("/api/v1/task-list/", fields="id,title,status")
+        self.assertEqual([list(doc) for doc in docs], [["id", "title", "status"]])
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"project_id"', sql)
+
+    def test_project_summary(self):
+        # The counts that were not asked for are not computed either.
+        docs, sql = self.get("/api/v1/project-summary/", fields="id,name")
+        self.assertEqual([list(doc) for doc in docs], [["id", "name"]])
+        self.assertNotIn("assigner_task", sql)
+        self.assertNotIn("assigner_submittedtask", sql)
+
+    def test_unknown(self):
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/task-list/", {"fields": "id,nope"})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.data["message"], "Unknown fields: nope")
+
+
+class SearchTests(TestCase):
+    """
+    Search runs against the database's full-text index (FTS5 under SQLite,
+    tsvector under PostgreSQL), which the migrations keep current.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Search", email="search@example.com", role="U"
+        )
+        cls.other = User.objects.create(
+            full_name="Other", email="search.other@example.com", role="U"
+        )
+        cls.project = Project.objects.create(
+            name="Billing revamp", description="Invoices and payments"
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def task(self, title, description="", assignee=None):
+        return Task.objects.create(
+            title=title,
+            description=description,
+            project=self.project,
+            assignee=assignee or self.user,
+            creator=self.user,
+        )
+
+    def search(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data["data"]
+
+    def ids(self, docs):
+        return [doc["id"] for doc in docs]
+
+    def test_title_match_ranks_first(self):
+        described = self.task("Write notes", "Export the invoice totals")
+        titled = self.task("Invoice export", "Write it up")
+        self.task("Unrelated", "Nothing to see")
+        data = self.search("/api/v1/task-search/", q="invoice")
+        self.assertEqual(self.ids(data["docs"]), [str(titled.pk), str(described.pk)])
+        self.assertGreater(data["docs"][0]["rank"], data["docs"][1]["rank"])
+
+    def test_only_own_tasks(self):
+        self.task("Invoice export", assignee=self.other)
+        data = self.search("/api/v1/task-search/", q="invoice")
+        self.assertEqual(data["docs"], [])
+
+    def test_index_follows_writes(self):
+        task = self.task("Invoice export")
+        Task.objects.bulk_create(
+            [
+                Task(
+                    title="Invoice import",
+                    project=self.project,
+                    assignee=self.user,
+                    creator=self.user,
+                )
+            ]
+        )
+        self.assertEqual(
+            len(self.search("/api/v1/task-search/", q="invoice")["docs"]), 2
+        )
+        Task.objects.filter(pk=task.pk).update(title="Receipt export")
+        self.assertEqual(
+            len(self.search("/api/v1/task-search/", q="invoice")["docs"]), 1
+        )
+        self.assertEqual(
+            self.ids(self.search("/api/v1/task-search/", q="receipt")["docs"]),
+            [str(task.pk)],
+        )
+        task.delete()
+        self.assertEqual(self.search("/api/v1/task-search/", q="receipt")["docs"], [])
+
+    def test_cursor_pages_through_ranked_results(self):
+        tasks = [
+            self.task(f"Invoice {index}", "invoice " * index) for index in range(7)
+        ]
+        seen = []
+        data = self.search("/api/v1/task-search/", q="invoice", limit=3)
+        while True:
+            seen += self.ids(data["docs"])
+            if not data["pagination"]["next"]:
+                break
+            with self.assertNumQueries(1):
+                response = self.client.get(data["pagination"]["next"])
+            data = response.data["data"]
+        self.assertCountEqual(seen, [str(task.pk) for task in tasks])
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_cursor_pages_through_tied_ranks(self):
+        # Equal documents rank equal, so the id alone orders them. Under
+        # PostgreSQL the cursor must carry ts_rank at the precision it is
+        # compared at, or rows on a page boundary are skipped or repeated.
+        tasks = [self.task("Invoice export", "Quarterly invoice") for _ in range(8)]
+        seen = []
+        data = self.search("/api/v1/task-search/", q="invoice", limit=3)
+        while True:
+            seen += self.ids(data["docs"])
+            if not data["pagination"]["next"]:
+                break
+            data = self.client.get(data["pagination"]["next"]).data["data"]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertCountEqual(seen, [str(task.pk) for task in tasks])
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_project_search(self):
+        data = self.search("/api/v1/project-search/", q="payments", status="D")
+        self.assertEqual(self.ids(data["docs"]), [str(self.project.pk)])
+
+    def test_query_is_required(self):
+        response = self.client.get("/api/v1/task-search/", {"q": " "})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.data["title"], "Search")
+
+    def test_index_installed_after_migrate(self):
+        backend = get_search_backend()
+        for table in SEARCH_DOCUMENTS:
+            self.assertTrue(backend.is_installed(connection, table), table)
+        self.assertEqual(install_missing_search_index(), [])
+
+    def test_lost_index_reinstalled(self):
+        # What a table rebuild for an AlterField leaves behind.
+        with connection.cursor() as cursor:
+            for statement in get_search_backend().uninstall_sql(
+                "assigner_task", SEARCH_DOCUMENTS["assigner_task"]
+            ):
+                cursor.execute(statement)
+        self.task("Quarterly invoice")
+        self.assertEqual(install_missing_search_index(), ["assigner_task"])
+        self.task("Yearly invoice")
+        data = self.search("/api/v1/task-search/", q="invoice")
+        self.assertEqual(len(data["docs"]), 2)
+
+
+class ResponseCacheTests(TestCase):
+    """
+    Cached list pages are served without queries until a model they are
+    built from is written.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Cache", email="cache@example.com", role="U"
+        )
+        cls.other = User.objects.create(
+            full_name="Cache Other", email="cache.other@example.com", role="U"
+        )
+        cls.project = Project.objects.create(name="Project", description="Project")
+
+    def setUp(self):
+        response_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, cache, client=None):
+        response = (client or self.client).get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response["X-Cache"], cache)
+        return response.data["data"]["docs"]
+
+    def test_hit_until_written(self):
+        self.get("/api/v1/project-list/", "MISS")
+        with self.assertNumQueries(0):
+            self.get("/api/v1/project-list/", "HIT")
+        Project.objects.create(name="New", description="New")
+        self.assertEqual(len(self.get("/api/v1/project-list/", "MISS")), 2)
+
+    def test_user_scope(self):
+        Task.objects.create(
+            title="Mine", project=self.project, assignee=self.user, creator=self.user
+        )
+        self.assertEqual(len(self.get("/api/v1/task-list/", "MISS")), 1)
+        other = APIClient()
+        other.force_authenticate(self.other)
+        self.assertEqual(self.get("/api/v1/task-list/", "MISS", other), [])
+
+    def test_contributors_invalidate_summary(self):
+        self.get("/api/v1/project-summary/", "MISS")
+        self.get("/api/v1/project-summary/", "HIT")
+        self.project.update_contributors(add=[self.user.pk])
+        docs = self.get("/api/v1/project-summary/", "MISS")
+        self.assertEqual(docs[0]["contributors_count"], 1)
+
+    def test_review_invalidates_submissions(self):
+        task = Task.objects.create(
+            title="Task", project=self.project, assignee=self.user, creator=self.user
+        )
+        submission = SubmittedTask.objects.create(
+            task=task, project=self.project, creator=self.user
+        )
+        self.get("/api/v1/task-submitted-list/", "MISS")
+        self.get("/api/v1/task-submitted-list/", "HIT")
+        review_submissions([submission.pk], self.user, True)
+        self.get("/api/v1/task-submitted-list/", "MISS")
+
+    def test_stats(self):
+        self.get("/api/v1/project-list/", "MISS")
+        self.get("/api/v1/project-list/", "HIT")
+        admin = APIClient()
+        admin.force_authenticate(
+            User.objects.create(full_name="Admin", email="a@example.com", role="A")
+        )
+        stats = admin.get("/api/v1/cache-stats/").data["data"]
+        self.assertEqual(stats["views"]["ProjectListViewSet"], {"hits": 1, "misses": 1})
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(self.client.get("/api/v1/cache-stats/").status_code, 401)
+
+    def test_disabled_for_local_backend_with_workers(self):
+        # Another worker would never see the write, so nothing is cached.
+        self.assertFalse(response_cache.backend.shared)
+        with mock.patch.object(response_cache, "workers", 4):
+            for _ in range(2):
+                with self.assertNumQueries(2):
+                    response = self.client.get("/api/v1/project-list/")
+                self.assertNotIn("X-Cache", response)
+        self.get("/api/v1/project-list/", "MISS")
+
+    def test_shared_django_cache(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = "django.core.cache.backends.filebased.FileBasedCache"
+            with override_settings(
+                CACHES={"shared": {"BACKEND": backend, "LOCATION": location}}
+            ):
+                cache = ResponseCache(DjangoCache("shared", prefix="pm:"), workers=4)
+                self.assertTrue(cache.enabled)
+                cache.backend.set("a", {"data": [1]})
+                self.assertEqual(
+                    cache.backend.get_many(["a", "b"]), {"a": {"data": [1]}}
+                )
+                self.assertEqual(cache.backend.cache.get("pm:a"), {"data": [1]})
+                [before] = cache.generations([Project])
+                cache.bump(Project)
+                self.assertNotEqual(cache.generations([Project]), [before])
+
+
+class ConditionalListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Conditional", email="conditional@example.com", role="U"
+        )
+        cls.project = Project.objects.create(name="Project", description="Project")
+
+    def setUp(self):
+        response_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_not_modified(self):
+        response = self.client.get("/api/v1/project-list/")
+        etag = response["ETag"]
+        response_cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/v1/project-list/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_not_modified_from_cache(self):
+        etag = self.client.get("/api/v1/project-list/")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/project-list/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_move_etag(self):
+        etag = self.client.get("/api/v1/project-list/")["ETag"]
+        project = Project.objects.create(name="New", description="New")
+        response = self.client.get("/api/v1/project-list/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        etag = response["ETag"]
+        project.delete()
+        response = self.client.get("/api/v1/project-list/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_params_move_etag(self):
+        first = self.client.get("/api/v1/project-list/")["ETag"]
+        second = self.client.get("/api/v1/project-list/", {"limit": 5})["ETag"]
+        self.assertNotEqual(first, second)
+
+    def test_cursor_page_etag(self):
+        # Taken from the page served, with no aggregate over the whole list.
+        params = {"pagination": "cursor"}
+        response = self.client.get("/api/v1/project-list/", params)
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+        response_cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/v1/project-list/", params, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        Project.objects.filter(pk=self.project.pk).update(name="Renamed")
+        response_cache.clear()
+        response = self.client.get(
+            "/api/v1/project-list/", params, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def set_modified_at(self, project, timestamp):
+        # update() skips auto_now and the signals, so the cache goes by hand.
+        Project.objects.filter(pk=project.pk).update(
+            modified_at=datetime.fromtimestamp(timestamp, timezone.utc)
+        )
+        response_cache.clear()
+
+    def get_at(self, now, **headers):
+        with mock.patch("common.mixins.time.time", return_value=now):
+            return self.client.get("/api/v1/project-list/", **headers)
+
+    def test_if_modified_since(self):
+        self.set_modified_at(self.project, 1700000000.2)
+        response = self.get_at(1700000005)
+        # The second after the last write.
+        self.assertEqual(response["Last-Modified"], "Tue, 14 Nov 2023 22:13:21 GMT")
+        response = self.get_at(
+            1700000005, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_last_modified_withheld_within_the_second(self):
+        # A write later in the same second would not move a Last-Modified
+        # sent now, so none is sent until the second is over.
+        self.set_modified_at(self.project, 1700000000.2)
+        self.assertNotIn("Last-Modified", self.get_at(1700000000.7))
+        last_modified = self.get_at(1700000001)["Last-Modified"]
+        other = Project.objects.create(name="Other", description="Other")
+        self.set_modified_at(other, 1700000001.0)
+        response = self.get_at(1700000005, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["Last-Modified"], last_modified)
+
+    def test_etag_per_role(self):
+        # Role-scoped pages are cached per role, so their ETag is too.
+        etag = self.client.get("/api/v1/project-list/")["ETag"]
+        response_cache.clear()
+        other = APIClient()
+        other.force_authenticate(
+            User.objects.create(full_name="Peer", email="peer@example.com", role="U")
+        )
+        self.assertEqual(other.get("/api/v1/project-list/")["ETag"], etag)
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Sync", email="sync@example.com", role="U"
+        )
+        cls.other = User.objects.create(
+            full_name="Sync Other", email="sync.other@example.com", role="U"
+        )
+        cls.project = Project.objects.create(name="Project", description="Project")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def task(self, assignee=None, title="Task"):
+        return Task.objects.create(
+            title=title,
+            description="Task",
+            project=self.project,
+            assignee=assignee or self.user,
+            creator=self.user,
+        )
+
+    def sync(self, token=None, **params):
+        if token:
+            params["token"] = token
+        response = self.client.get("/api/v1/sync/", params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data["data"]
+
+    def ids(self, rows, key="id"):
+        return {str(row[key]) for row in rows}
+
+    def test_initial_sync(self):
+        task = self.task()
+        self.task(assignee=self.other)
+        submission = SubmittedTask.objects.create(
+            task=task, project=self.project, creator=self.user
+        )
+        data = self.sync()
+        self.assertEqual(self.ids(data["tasks"]), {str(task.pk)})
+        self.assertEqual(self.ids(data["submissions"]), {str(submission.pk)})
+        self.assertEqual(data["deleted"], [])
+        self.assertFalse(data["has_more"])
+
+    def test_only_changes_since_token(self):
+        changed, unchanged = self.task(), self.task()
+        token = self.sync()["token"]
+        self.assertEqual(self.sync(token)["tasks"], [])
+        changed.title = "Changed"
+        changed.save()
+        data = self.sync(token)
+        self.assertEqual(self.ids(data["tasks"]), {str(changed.pk)})
+        self.assertNotIn(str(unchanged.pk), self.ids(data["tasks"]))
+
+    def test_deletions_and_reassignments(self):
+        deleted, moved = self.task(), self.task()
+        token = self.sync()["token"]
+        deleted_pk = deleted.pk
+        deleted.delete()
+        moved = Task.objects.get(pk=moved.pk)
+        moved.assignee = self.other
+        moved.save()
+        data = self.sync(token)
+        self.assertEqual(data["tasks"], [])
+        self.assertEqual(
+            self.ids(data["deleted"], "object_id"), {str(deleted_pk), str(moved.pk)}
+        )
+
+        other = APIClient()
+        other.force_authenticate(self.other)
+        response = other.get("/api/v1/sync/")
+        self.assertEqual(self.ids(response.data["data"]["tasks"]), {str(moved.pk)})
+
+    def test_reassigned_back_is_not_deleted(self):
+        task = self.task()
+        token = self.sync()["token"]
+        task = Task.objects.get(pk=task.pk)
+        task.assignee = self.other
+        task.save()
+        task = Task.objects.get(pk=task.pk)
+        task.assignee = self.user
+        task.save()
+        data = self.sync(token)
+        self.assertEqual(self.ids(data["tasks"]), {str(task.pk)})
+        self.assertEqual(data["deleted"], [])
+
+    def test_pages(self):
+        tasks = [self.task(title=f"Task {index}") for index in range(5)]
+        seen, token, has_more = [], None, True
+        while has_more:
+            with self.assertNumQueries(3):
+                data = self.sync(token, limit=2)
+            seen += [row["id"] for row in data["tasks"]]
+            token, has_more = data["token"], data["has_more"]
+        self.assertEqual(sorted(seen), sorted(str(task.pk) for task in tasks))
+
+    def test_pages_through_equal_timestamps(self):
+        tasks = [self.task(title=f"Task {index}") for index in range(5)]
+        # review_submissions stamps a whole batch with one modified_at.
+        Task.objects.update(modified_at=tasks[0].modified_at)
+        seen, token, has_more = [], None, True
+        while has_more:
+            data = self.sync(token, limit=2)
+            seen += [row["id"] for row in data["tasks"]]
+            token, has_more = data["token"], data["has_more"]
+        self.assertEqual(sorted(seen), sorted(str(task.pk) for task in tasks))
+
+    @override_settings(SYNC_SETTLE_SECONDS=60)
+    def test_unsettled_rows_wait(self):
+        self.task()
+        self.assertEqual(self.sync()["tasks"], [])
+
+    def test_invalid_token(self):
+        response = self.client.get("/api/v1/sync/", {"token": "nope"})
+        self.assertEqual(response.status_code, 422)
+        other = APIClient()
+        other.force_authenticate(self.other)
+        token = other.get("/api/v1/sync/").data["data"]["token"]
+        response = self.client.get("/api/v1/sync/", {"token": token})
+        self.assertEqual(response.status_code, 422)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            full_name="Export", email="export@example.com", role="HR"
+        )
+        project = Project.objects.create(name="Project", description="Project")
+        cls.submissions = [
+            SubmittedTask.objects.create(
+                task=Task.objects.create(
+                    title=f"Task {index}",
+                    description="Task",
+                    project=project,
+                    assignee=cls.user,
+                    creator=cls.user,
+                ),
+                project=project,
+                creator=cls.user,
+                is_approved=index % 2 == 0,
+                remarks='Quoted, "with" comma' if index == 0 else None,
+            )
+            for index in range(5)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, **params):
+        response = self.client.get("/api/v1/task-submitted-export/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    @override_settings(DEBUG=True)
+    def test_csv(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(csv.DictReader(io.StringIO(self.export())))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            [row["id"] for row in rows], [str(s.pk) for s in self.submissions]
+        )
+        self.assertEqual(rows[0]["task_title"], "Task 0")
+        self.assertEqual(rows[0]["project_name"], "Project")
+        self.assertEqual(rows[0]["creator_name"], "Export")
+        self.assertEqual(rows[0]["remarks"], 'Quoted, "with" comma')
+        self.assertEqual(rows[1]["remarks"], "")
+
+    def test_csv_formulas_quoted(self):
+        formulas = ["=1+1", "+1", "-2", "@SUM(A1)"]
+        for submission, formula in zip(self.submissions, formulas):
+            SubmittedTask.objects.filter(pk=submission.pk).update(remarks=formula)
+        Task.objects.filter(pk=self.submissions[0].task_id).update(title="=HYPERLINK()")
+        rows = list(csv.DictReader(io.StringIO(self.export())))
+        self.assertEqual(
+            [row["remarks"] for row in rows[:4]], [f"'{value}" for value in formulas]
+        )
+        self.assertEqual(rows[0]["task_title"], "'=HYPERLINK()")
+        self.assertEqual(rows[1]["task_title"], "Task 1")
+        lines = self.export(output="ndjson").splitlines()
+        self.assertEqual(json.loads(lines[0])["remarks"], "=1+1")
+
+    def test_ndjson(self):
+        lines = self.export(output="ndjson", is_approved="true").splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [str(s.pk) for s in self.submissions if s.is_approved],
+        )
+        self.assertIsNone(rows[1]["remarks"])
+        self.assertTrue(rows[0]["created_at"].endswith("Z"))
+
+    def test_invalid_output(self):
+        response = self.client.get("/api/v1/task-submitted-export/", {"output": "xml"})
+        self.assertEqual(response.status_code, 422)
+
+    def test_denied(self):
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create(full_name="User", email="u@example.com", role="U")
+        )
+        response = client.get("/api/v1/task-submitted-export/")
+        self.assertEqual(response.status_code, 401)
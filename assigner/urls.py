@@ -4,13 +4,22 @@ from assigner.api.viewsets.accounts import (
     LoginViewSet,
     ProjectCreateViewSet,
     ProjectListViewSet,
+    ProjectSummaryViewSet,
+    ProjectSearchViewSet,
     ProjectEditViewSet,
+    ProjectContributorsViewSet,
     TaskCreateViewSet,
+    TaskBulkCreateViewSet,
     TaskEditViewSet,
     TaskListViewSet,
+    TaskSearchViewSet,
     SubmitTaskViewSet,
     SubmitTaskEditViewSet,
+    SubmitTaskBulkEditViewSet,
     TaskSubmitListViewSet,
+    TaskSubmitExportViewSet,
+    CacheStatsViewSet,
+    SyncViewSet,
 )
 
 
@@ -19,11 +28,20 @@ urlpatterns = [
     path("login/", LoginViewSet.as_view()),
     path("project-create/", ProjectCreateViewSet.as_view()),
     path("project-list/", ProjectListViewSet.as_view()),
+    path("project-summary/", ProjectSummaryViewSet.as_view()),
+    path("project-search/", ProjectSearchViewSet.as_view()),
     path("project-edit/<str:pk>/", ProjectEditViewSet.as_view()),
+    path("project-contributors/<str:pk>/", ProjectContributorsViewSet.as_view()),
     path("task-create/", TaskCreateViewSet.as_view()),
+    path("task-bulk-create/", TaskBulkCreateViewSet.as_view()),
     path("task-edit/<str:pk>/", TaskEditViewSet.as_view()),
     path("task-list/", TaskListViewSet.as_view()),
+    path("task-search/", TaskSearchViewSet.as_view()),
     path("task-submitting-create/", SubmitTaskViewSet.as_view()),
     path("task-submitted-edit/<str:pk>/", SubmitTaskEditViewSet.as_view()),
+    path("task-submitted-bulk-edit/", SubmitTaskBulkEditViewSet.as_view()),
     path("task-submitted-list/", TaskSubmitListViewSet.as_view()),
+    path("task-submitted-export/", TaskSubmitExportViewSet.as_view()),
+    path("cache-stats/", CacheStatsViewSet.as_view()),
+    path("sync/", SyncViewSet.as_view()),
 ]
@@ -0,0 +1,96 @@
+import copy
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from common.cache import LRUCache
+
+USER_CLAIMS = ("role", "is_active", "is_blocked")
+
+user_cache = LRUCache(
+    maxsize=getattr(settings, "USER_CACHE_SIZE", 4096),
+    ttl=getattr(settings, "USER_CACHE_TTL", 60),
+)
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens also carry the user's role and status."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that keeps resolved users in a short-lived
+    in-process cache, dropped whenever the user is saved or deleted, or
+    users are changed with ``QuerySet.update()``. Each request gets its own
+    copy of the cached user, so changes a view makes to ``request.user``
+    never reach other requests or threads.
+
+    With ``JWT_TRUST_USER_CLAIMS`` a cache miss is answered from the token's
+    role and status claims instead of the database; the other fields load
+    on first access. Status changes then only apply to tokens issued after
+    them, so it is off by default.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is not None:
+            return copy.copy(user)
+
+        if getattr(settings, "JWT_TRUST_USER_CLAIMS", False) and all(
+            claim in validated_token for claim in USER_CLAIMS
+        ):
+            user = self.user_from_claims(validated_token)
+        else:
+            user = super().get_user(validated_token)
+        user_cache.set(user_id, user)
+        return copy.copy(user)
+
+    def user_from_claims(self, validated_token):
+        pk = self.user_model._meta.pk
+        claims = {claim: validated_token[claim] for claim in USER_CLAIMS}
+        claims[api_settings.USER_ID_FIELD] = pk.to_python(
+            validated_token[api_settings.USER_ID_CLAIM]
+        )
+        # from_db() expects the loaded fields in model order.
+        field_names = [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname in claims
+        ]
+        return self.user_model.from_db(
+            None, field_names, [claims[name] for name in field_names]
+        )
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.delete(str(instance.pk))
+
+
+def invalidate_cached_users():
+    """
+    Drops every cached user. For ``QuerySet.update()``, which sends no
+    signals and does not say which rows it changed.
+    """
+    user_cache.clear()
+
+
+post_save.connect(invalidate_cached_user, sender=settings.AUTH_USER_MODEL)
+post_delete.connect(invalidate_cached_user, sender=settings.AUTH_USER_MODEL)
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Documents CachedJWTAuthentication as the same bearer scheme."""
+
+    target_class = "common.authentication.CachedJWTAuthentication"
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache. Entries expire ``ttl`` seconds after
+    they are set; ``ttl=None`` keeps them until evicted.
+    """
+
+    # Every process has its own copy.
+    shared = False
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return default
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def get_many(self, keys):
+        return {key: value for key in keys if (value := self.get(key)) is not None}
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisCache:
+    """
+    The LRUCache interface over a Redis server, for caches shared by every
+    worker. Values are stored as JSON, so they must be JSON-serializable.
+    Needs the ``redis`` package.
+    """
+
+    shared = True
+
+    def __init__(self, url="redis://localhost:6379/0", ttl=None, prefix=""):
+        import redis
+
+        from common.renderers import dumps, loads
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._dumps = dumps
+        self._loads = loads
+
+    def get(self, key, default=None):
+        value = self.client.get(self.prefix + key)
+        return default if value is None else self._loads(value)
+
+    def get_many(self, keys):
+        values = self.client.mget([self.prefix + key for key in keys])
+        return {
+            key: self._loads(value)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, self._dumps(value), ex=ttl or None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            self.client.delete(key)
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}*"))
+
+
+class DjangoCache:
+    """
+    The LRUCache interface over one of Django's ``CACHES``, so the response
+    cache can use the Redis or memcached server the project is configured
+    with. ``clear()`` clears that whole cache, so give it an alias of its
+    own. Process-local Django backends are not ``shared``.
+    """
+
+    def __init__(self, alias="default", ttl=None, prefix=""):
+        from django.core.cache import caches
+        from django.core.cache.backends.dummy import DummyCache
+        from django.core.cache.backends.locmem import LocMemCache
+
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.prefix = prefix
+        self.shared = not isinstance(self.cache, (DummyCache, LocMemCache))
+
+    def get(self, key, default=None):
+        return self.cache.get(self.prefix + key, default)
+
+    def get_many(self, keys):
+        values = self.cache.get_many([self.prefix + key for key in keys])
+        return {
+            key: values[self.prefix + key]
+            for key in keys
+            if self.prefix + key in values
+        }
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self.cache.set(self.prefix + key, value, timeout=ttl or None)
+
+    def delete(self, key):
+        self.cache.delete(self.prefix + key)
+
+    def clear(self):
+        self.cache.clear()
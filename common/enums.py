@@ -17,3 +17,8 @@ STATUS_CHOICES = (
     ("O", "Ongoing"),
     ("C", "Completed"),
 )
+
+# Label lookups for serializers, so rows skip get_FOO_display().
+GENDER_LABELS = dict(GENDER_CHOICES)
+ROLE_LABELS = dict(ROLE_CHOICES)
+STATUS_LABELS = dict(STATUS_CHOICES)
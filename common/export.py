@@ -0,0 +1,93 @@
+import csv
+
+from django.http import StreamingHttpResponse
+
+from common.exceptions import UnprocessableEntityException
+from common.renderers import _default, dumps
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _Line:
+    """File-like object whose write() hands the CSV line back."""
+
+    def write(self, value):
+        return value
+
+
+# Spreadsheet apps evaluate a cell starting with one of these as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        # Titles, descriptions and remarks are user input; a leading quote
+        # makes the spreadsheet show them as text.
+        return f"'{value}" if value.startswith(FORMULA_PREFIXES) else value
+    if isinstance(value, (int, float)):
+        return value
+    return _default(value)
+
+
+def csv_chunks(rows, columns, chunk_size):
+    """The header, then one string per ``chunk_size`` rows."""
+    writer = csv.writer(_Line())
+    yield writer.writerow(columns)
+    lookups = list(columns.values())
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow([_csv_value(row[lookup]) for lookup in lookups]))
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def ndjson_chunks(rows, columns, chunk_size):
+    """One JSON object per line, ``chunk_size`` lines per chunk."""
+    lines = []
+    for row in rows:
+        lines.append(dumps({column: row[lookup] for column, lookup in columns.items()}))
+        if len(lines) >= chunk_size:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+EXPORT_WRITERS = {
+    "csv": csv_chunks,
+    "ndjson": ndjson_chunks,
+}
+
+
+def streaming_export(queryset, columns, output, filename, chunk_size=2000):
+    """
+    Streams ``queryset`` as CSV or NDJSON. ``columns`` maps each output
+    column to a ``values()`` lookup; lookups that follow a relation are
+    joined into the same query. Rows are read through
+    ``iterator(chunk_size)``, a server-side cursor where the database has
+    them, so memory does not grow with the number of rows.
+    """
+    if output not in EXPORT_WRITERS:
+        raise UnprocessableEntityException(
+            {
+                "title": "Export",
+                "message": f"Output must be one of {', '.join(EXPORT_WRITERS)}",
+            }
+        )
+    rows = queryset.values(*dict.fromkeys(columns.values()))
+    response = StreamingHttpResponse(
+        EXPORT_WRITERS[output](
+            rows.iterator(chunk_size=chunk_size), columns, chunk_size
+        ),
+        content_type=EXPORT_CONTENT_TYPES[output],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{output}"'
+    return response
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor taken from
+    ``settings.PASSWORD_HASHER_ITERATIONS``. It keeps the ``pbkdf2_sha256``
+    algorithm name, so existing hashes verify unchanged and are rehashed on
+    login when their iteration count differs from the setting.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings, "PASSWORD_HASHER_ITERATIONS", PBKDF2PasswordHasher.iterations
+        )
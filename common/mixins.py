@@ -0,0 +1,285 @@
+import hashlib
+import json
+import math
+import time
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.response import Response
+from rest_framework.serializers import raise_errors_on_nested_writes
+from rest_framework.utils import model_meta
+from rest_framework.utils.encoders import JSONEncoder
+
+from common.exceptions import UnprocessableEntityException
+from common.response_cache import response_cache, response_owner
+from common.serializer import envelope
+from common.validators import validate_uuid
+
+
+class ValuesQuerysetMixin:
+    """
+    Lists ``values()`` rows for a ValuesSerializer instead of model instances.
+
+    ``?fields=a,b`` narrows both the selected columns and the output to those
+    serializer fields. The ordering columns are always selected too, for the
+    cursor paginator.
+    """
+
+    fields_query_param = "fields"
+
+    def get_fields(self):
+        request = getattr(self, "request", None)
+        value = request.query_params.get(self.fields_query_param) if request else None
+        if not value:
+            return None
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        names = list(dict.fromkeys(names))
+        available = self.get_serializer_class().field_names()
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise UnprocessableEntityException(
+                {
+                    "title": "Fields",
+                    "message": f"Unknown fields: {', '.join(unknown)}",
+                }
+            )
+        return names or None
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        columns = self.get_serializer_class().values_columns(self.get_fields())
+        ordering = [name.lstrip("-") for name in queryset.query.order_by]
+        return queryset.values(*dict.fromkeys([*columns, *ordering]))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_fields()
+        return context
+
+
+def conditional_response(request, response):
+    """
+    A 304 (or 412) when the request's preconditions say the client's copy of
+    ``response`` is current, else ``response``. The validators are read from
+    its ``ETag`` and ``Last-Modified`` headers.
+    """
+    last_modified = response.get("Last-Modified")
+    return get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=last_modified and parse_http_date_safe(last_modified),
+        response=response,
+    )
+
+
+def last_modified_headers(timestamp):
+    """
+    ``Last-Modified`` for ``timestamp``, a whole second, once that second is
+    over. Sent any earlier, a write later in the same second would leave it
+    unchanged and a client holding it would get a wrong 304.
+    """
+    if timestamp and timestamp <= time.time():
+        return {"Last-Modified": http_date(timestamp)}
+    return {}
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET for list views. The validators come from one aggregate
+    over the filtered queryset, ``MAX(modified_at)`` and the row count, so a
+    304 is answered before any row is read or serialized. The count is handed
+    to the paginator, which then skips its own.
+
+    Only for views whose rows are read from the model's own columns: a
+    change elsewhere (an annotation over another table) does not move the
+    validators. A delete lowers the count but not ``Last-Modified``, so
+    clients should send ``If-None-Match``.
+
+    ``Last-Modified`` has one-second resolution, so it is the second after
+    ``MAX(modified_at)`` and is only sent once that second is over: any
+    later write then lands in a later second.
+
+    Cursor pages skip the aggregate, which would scan the whole list and
+    undo the constant cost of keyset paging. Their ETag is a hash of the
+    page as served, so a 304 saves the transfer but not the page query.
+    """
+
+    def list(self, request, *args, **kwargs):
+        wants_cursor = getattr(self.paginator, "wants_cursor", None)
+        if wants_cursor is not None and wants_cursor(request):
+            response = super().list(request, *args, **kwargs)
+            response["ETag"] = self.get_etag(json.dumps(response.data, cls=JSONEncoder))
+            return conditional_response(request, response)
+        headers = self.get_validators(self.filter_queryset(self.get_queryset()))
+        response = conditional_response(request, HttpResponse(headers=headers))
+        if response.status_code != 200:
+            return response
+        response = super().list(request, *args, **kwargs)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def get_validators(self, queryset):
+        # modified_at is never null, so both read the modified_at index.
+        aggregate = queryset.order_by().aggregate(
+            count=Count("modified_at"), last_modified=Max("modified_at")
+        )
+        self.known_count = aggregate["count"]
+        last_modified = aggregate["last_modified"]
+        headers = {
+            "ETag": self.get_etag(
+                str(aggregate["count"]),
+                last_modified.isoformat() if last_modified else "",
+            )
+        }
+        self.last_modified = last_modified and math.floor(last_modified.timestamp()) + 1
+        return {**headers, **last_modified_headers(self.last_modified)}
+
+    def get_etag(self, *versions):
+        # Also covers the view, the full URL and who the page was built for.
+        version = "|".join(
+            [
+                type(self).__name__,
+                self.request.build_absolute_uri(),
+                response_owner(self, self.request),
+                *versions,
+            ]
+        )
+        return f'W/"{hashlib.sha1(version.encode()).hexdigest()}"'
+
+
+class CachedListMixin:
+    """
+    Serves ``list()`` from the response cache. ``cache_models`` are the
+    models the page is built from; a write to any of them invalidates it.
+    ``cache_scope`` is ``"role"`` when every user with the same role gets
+    the same page, or ``"user"`` when the queryset depends on the user.
+    The ``X-Cache`` header says whether the page was a ``HIT`` or a ``MISS``,
+    and is left out while the cache is disabled.
+    Validator headers are cached with the page, so a hit can still be a 304.
+    """
+
+    cache_models = ()
+    cache_scope = "role"
+    # Last-Modified is cached as a timestamp, see last_modified_headers().
+    cached_headers = ("ETag",)
+
+    def list(self, request, *args, **kwargs):
+        if not response_cache.enabled:
+            return super().list(request, *args, **kwargs)
+        name = type(self).__name__
+        key = response_cache.key(self, request)
+        cached = response_cache.get(key, name)
+        if cached is not None:
+            headers = {
+                **cached["headers"],
+                **last_modified_headers(cached["last_modified"]),
+            }
+            response = conditional_response(
+                request, Response(cached["data"], headers=headers)
+            )
+            response["X-Cache"] = "HIT"
+            return response
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {
+                header: response[header]
+                for header in self.cached_headers
+                if header in response
+            }
+            response_cache.set(
+                key,
+                {
+                    "data": response.data,
+                    "headers": headers,
+                    "last_modified": getattr(self, "last_modified", None),
+                },
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class EnvelopeListMixin:
+    """
+    ``list()`` that puts the page straight into the ``{"title", "message",
+    "data"}`` envelope instead of wrapping the paginator's Response.
+    """
+
+    envelope_title = None
+    envelope_message = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            data = self.get_serializer(queryset, many=True).data
+        else:
+            data = self.paginator.get_paginated_data(
+                self.get_serializer(page, many=True).data
+            )
+        return Response(envelope(self.envelope_title, self.envelope_message, data))
+
+
+class EditMixin:
+    """
+    Loads the object being edited with a single query. A malformed pk raises
+    ``invalid_pk_error`` and a missing row raises ``not_found_error``, both as
+    UnprocessableEntityException payloads.
+    """
+
+    invalid_pk_error = None
+    not_found_error = None
+
+    def get_lookup_value(self):
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        if not validate_uuid(pk):
+            raise UnprocessableEntityException(self.invalid_pk_error, code=422)
+        return pk
+
+    def get_object(self):
+        pk = self.get_lookup_value()
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            obj = queryset.get(**{self.lookup_field: pk})
+        except ObjectDoesNotExist:
+            raise UnprocessableEntityException(self.not_found_error, code=422)
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class UpdateFieldsMixin:
+    """
+    ModelSerializer ``update()`` that only writes the columns whose value
+    changed, plus ``modified_at``, and skips the UPDATE when nothing did.
+    """
+
+    def update(self, instance, validated_data):
+        raise_errors_on_nested_writes("update", self, validated_data)
+        info = model_meta.get_field_info(instance)
+        changed = []
+        many_to_many = []
+        for attr, value in validated_data.items():
+            relation = info.relations.get(attr)
+            if relation and relation.to_many:
+                many_to_many.append((attr, value))
+                continue
+            if relation:
+                field = instance._meta.get_field(attr)
+                current = getattr(instance, field.attname)
+                if current == getattr(value, "pk", value):
+                    continue
+            elif getattr(instance, attr) == value:
+                continue
+            setattr(instance, attr, value)
+            changed.append(attr)
+
+        if changed:
+            if "modified_at" in info.fields:
+                changed.append("modified_at")
+            instance.save(update_fields=changed)
+        for attr, value in many_to_many:
+            getattr(instance, attr).set(value)
+        return instance
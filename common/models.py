@@ -3,9 +3,7 @@ from uuid import uuid4
 
 
 class CommonInfo(models.Model):
-    id = models.UUIDField(
-        primary_key=True, default=uuid4, editable=False, db_index=True
-    )
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     created_at = models.DateTimeField("Created at", auto_now_add=True, db_index=True)
     creator = models.ForeignKey(
         "assigner.User",
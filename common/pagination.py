@@ -1,20 +1,245 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from common.exceptions import UnprocessableEntityException
+
+
+class CustomCursorPagination(BasePagination):
+    """
+    Keyset pagination on ``(created_at, id)``.
+
+    Each page is a single range scan on the ordering index, so the cost of a
+    page does not depend on how deep it is, and no ``COUNT(*)`` is run.
+    """
+
+    page_size = 10
+    page_size_query_param = "limit"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering = ("-created_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.fields = [
+            self.get_field(queryset, name.lstrip("-")) for name in self.ordering
+        ]
+
+        position, reverse = self.decode_cursor(request)
+        ordering = invert_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(keyset_filter(ordering, position))
+
+        results = list(queryset[: self.page_size + 1])
+        has_extra = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_extra
+        else:
+            self.has_next = has_extra
+            self.has_previous = position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            "docs": data,
+            "pagination": {
+                "count": None,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = tuple(queryset.query.order_by) or self.ordering
+        if ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering += ("-id" if ordering[-1].startswith("-") else "id",)
+        return ordering
+
+    def get_field(self, queryset, name):
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        if name == "pk":
+            return queryset.model._meta.pk
+        return queryset.model._meta.get_field(name)
+
+    def get_position(self, obj):
+        if isinstance(obj, dict):
+            return [obj[name.lstrip("-")] for name in self.ordering]
+        return [getattr(obj, name.lstrip("-")) for name in self.ordering]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({"p": position, "r": int(reverse)}, default=str)
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = remove_query_param(self.base_url, "page")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values = payload["p"]
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                field.to_python(value) for field, value in zip(self.fields, values)
+            ]
+            return position, bool(payload.get("r"))
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise UnprocessableEntityException(
+                {
+                    "title": "Pagination",
+                    "message": "Invalid cursor",
+                }
+            )
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor returned in pagination.next or pagination.previous",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+def invert_ordering(ordering):
+    return tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+
+def keyset_filter(ordering, position):
+    """
+    Rows strictly after ``position`` for the given ordering, i.e.
+    ``a < x OR (a = x AND b < y)`` for ``("-a", "-b")``.
+    """
+    condition = Q()
+    equal = {}
+    for name, value in zip(ordering, position):
+        field = name.lstrip("-")
+        lookup = "lt" if name.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{field}__{lookup}": value})
+        equal[field] = value
+    # Bound the leading column too, so the database can range scan its index.
+    first = ordering[0]
+    bound = "lte" if first.startswith("-") else "gte"
+    return condition & Q(**{f"{first.lstrip('-')}__{bound}": position[0]})
+
+
+class CountedPaginator(Paginator):
+    """Paginator that takes a count already known, skipping its COUNT(*)."""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
 
 
 class CustomPagination(PageNumberPagination):
     page_size = 10
     page_query_param = "page"
     page_size_query_param = "limit"
+    mode_query_param = "pagination"
+    cursor_pagination_class = CustomCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.wants_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        # A view that already counted the filtered queryset (ConditionalListMixin)
+        # leaves it in ``known_count``.
+        self.django_paginator_class = partial(
+            CountedPaginator, count=getattr(view, "known_count", None)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def wants_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
 
     def get_paginated_response(self, data):
-        return Response(
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_data(data)
+        return {
+            "docs": data,
+            "pagination": {
+                "count": self.page.paginator.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
             {
-                "docs": data,
-                "pagination": {
-                    "count": self.page.paginator.count,
-                    "next": self.get_next_link(),
-                    "previous": self.get_previous_link(),
-                },
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to 'cursor' for keyset pagination without a total count",
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
             }
         )
+        parameters.append(
+            self.cursor_pagination_class().get_schema_operation_parameters(view)[0]
+        )
+        return parameters
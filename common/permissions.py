@@ -1,6 +1,7 @@
 from rest_framework import permissions
 
 from common import exceptions
+from common.enums import ROLE_CHOICES
 
 
 class IsAuthenticated(permissions.BasePermission):
@@ -57,137 +58,77 @@ class IsAuthenticatedOrReadOnly(permissions.BasePermission):
         return flag
 
 
-class IsAdmin(permissions.BasePermission):
-    def has_permission(self, request, view):
-        flag = False
-        try:
-            flag = bool(request.user.role == "A")
-        except:
-            pass
-        if not flag:
-            raise exceptions.UnprocessableEntityException(
-                detail={
-                    "title": "Unauthenticated",
-                    "message": "Not authenticated for admin request",
-                },
-                code=401,
-            )
-        return flag
-
-    def has_object_permission(self, request, view, obj):
-        return True
+class HasRole(permissions.BasePermission):
+    """
+    Allows users whose role is in ``roles``. Subclasses only declare the
+    frozenset and the message, so the check is one set lookup.
+    """
 
+    roles = frozenset()
+    denied_message = "Not authenticated for this request"
 
-class IsSuperAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
-        flag = False
-        try:
-            flag = bool(request.user.role == "SA")
-        except:
-            pass
-        if not flag:
-            raise exceptions.UnprocessableEntityException(
-                detail={
-                    "title": "Unauthenticated",
-                    "message": "Not authenticated for superadmin request",
-                },
-                code=401,
-            )
-        return flag
+        if getattr(request.user, "role", None) in self.roles:
+            return True
+        raise exceptions.UnprocessableEntityException(
+            detail={
+                "title": "Unauthenticated",
+                "message": self.denied_message,
+            },
+            code=401,
+        )
 
     def has_object_permission(self, request, view, obj):
         return True
 
 
-class IsSuperAdminOrAdmin(permissions.BasePermission):
-    def has_permission(self, request, view):
-        flag = False
-        try:
-            flag = bool(request.user.role == "A" or request.user.role == "SA")
-        except:
-            pass
-        if not flag:
-            raise exceptions.UnprocessableEntityException(
-                detail={
-                    "title": "Unauthenticated",
-                    "message": "Not authenticated for super admin request",
-                },
-                code=401,
-            )
-        return flag
+class IsAdmin(HasRole):
+    roles = frozenset({"A"})
+    denied_message = "Not authenticated for admin request"
 
-    def has_object_permission(self, request, view, obj):
-        return True
 
+class IsSuperAdmin(HasRole):
+    roles = frozenset({"SA"})
+    denied_message = "Not authenticated for superadmin request"
 
-class IsUser(permissions.BasePermission):
-    def has_permission(self, request, view):
-        flag = False
-        try:
-            flag = bool(request.user.role == "U")
-        except:
-            pass
-        if not flag:
-            raise exceptions.UnprocessableEntityException(
-                detail={
-                    "title": "Unauthenticated",
-                    "message": "Not authenticated for user request",
-                },
-                code=401,
-            )
-        return flag
 
-    def has_object_permission(self, request, view, obj):
-        return True
+class IsSuperAdminOrAdmin(HasRole):
+    roles = frozenset({"A", "SA"})
+    denied_message = "Not authenticated for super admin request"
 
 
-class IsSupervisor(permissions.BasePermission):
-    def has_permission(self, request, view):
-        flag = False
-        try:
-            flag = bool(request.user.role == "SU")
-        except:
-            pass
-        if not flag:
-            raise exceptions.UnprocessableEntityException(
-                detail={
-                    "title": "Unauthenticated",
-                    "message": "Not authenticated for supervisor request",
-                },
-                code=401,
-            )
-        return flag
+class IsUser(HasRole):
+    roles = frozenset({"U"})
+    denied_message = "Not authenticated for user request"
 
-    def has_object_permission(self, request, view, obj):
-        return True
 
+class IsSupervisor(HasRole):
+    roles = frozenset({"SU"})
+    denied_message = "Not authenticated for supervisor request"
 
-class IsHumanResource(permissions.BasePermission):
-    def has_permission(self, request, view):
-        flag = False
-        try:
-            flag = bool(request.user.role == "HR")
-        except:
-            pass
-        if not flag:
-            raise exceptions.UnprocessableEntityException(
-                detail={
-                    "title": "Unauthenticated",
-                    "message": "Not authenticated for human resource request",
-                },
-                code=401,
-            )
-        return flag
 
-    def has_object_permission(self, request, view, obj):
-        return True
+class IsHumanResource(HasRole):
+    roles = frozenset({"HR"})
+    denied_message = "Not authenticated for human resource request"
+
+
+class IsHrOrSupervisor(HasRole):
+    roles = frozenset({"HR", "SU"})
+    denied_message = "Not authenticated for HR Supervisor request"
 
 
 def method_permission_classes(classes):
     def decorator(func):
         def decorated_func(self, *args, **kwargs):
-            self.permission_classes = classes
-            self.check_permissions(self.request)
+            # Checked on fresh instances; the view's permission_classes are
+            # shared by every thread serving it and must not be reassigned.
+            for permission in (permission_class() for permission_class in classes):
+                if not permission.has_permission(self.request, self):
+                    self.permission_denied(
+                        self.request,
+                        message=getattr(permission, "message", None),
+                        code=getattr(permission, "code", None),
+                    )
             return func(self, *args, **kwargs)
 
         return decorated_func
@@ -195,22 +136,89 @@ def method_permission_classes(classes):
     return decorator
 
 
-class IsHrOrSupervisor(permissions.BasePermission):
+ALL_ROLES = tuple(role for role, _ in ROLE_CHOICES)
+
+ROLE_NAMES = {
+    frozenset({"HR"}): "human resource",
+    frozenset({"SU"}): "supervisor",
+    frozenset({"HR", "SU"}): "HR Supervisor",
+    frozenset({"A"}): "admin",
+    frozenset({"SA"}): "superadmin",
+    frozenset({"A", "SA"}): "super admin",
+}
+
+# Roles allowed for each permission scope and request method. A view opts in
+# with ``permission_classes = [RolePermission]`` and ``permission_scope``.
+ROLE_PERMISSIONS = {
+    "project-create": {"POST": ("HR",)},
+    "project-list": {"GET": ALL_ROLES},
+    "project-summary": {"GET": ALL_ROLES},
+    "project-search": {"GET": ALL_ROLES},
+    "project-edit": {"PATCH": ("HR",)},
+    "project-contributors": {"PATCH": ("HR",)},
+    "task-create": {"POST": ("HR", "SU")},
+    "task-bulk-create": {"POST": ("HR", "SU")},
+    "task-edit": {"PATCH": ("HR", "SU")},
+    "task-list": {"GET": ALL_ROLES},
+    "task-search": {"GET": ALL_ROLES},
+    "task-submitting-create": {"POST": ALL_ROLES},
+    "task-submitted-edit": {"PATCH": ("HR", "SU")},
+    "task-submitted-bulk-edit": {"PATCH": ("HR", "SU")},
+    "task-submitted-list": {"GET": ALL_ROLES},
+    "task-submitted-export": {"GET": ("HR", "SU")},
+    "cache-stats": {"GET": ("SA", "A")},
+    "sync": {"GET": ALL_ROLES},
+}
+
+
+def compile_role_permissions(matrix):
+    """
+    Flattens the matrix into ``{(scope, method): (roles, denied message)}``
+    with frozensets, once at import time. The result is never mutated, so
+    threaded workers can read it without locking.
+    """
+    compiled = {}
+    for scope, methods in matrix.items():
+        for method, roles in methods.items():
+            roles = frozenset(roles)
+            name = ROLE_NAMES.get(roles, scope)
+            compiled[(scope, method.upper())] = (
+                roles,
+                f"Not authenticated for {name} request",
+            )
+    return compiled
+
+
+PERMISSION_MATRIX = compile_role_permissions(ROLE_PERMISSIONS)
+
+
+class RolePermission(IsAuthenticated):
+    """
+    Authenticated, active, unblocked users whose role is allowed for the
+    view's ``permission_scope`` and the request method in ROLE_PERMISSIONS.
+    """
+
     def has_permission(self, request, view):
-        flag = False
+        super().has_permission(request, view)
+        if request.method == "OPTIONS":
+            # Metadata only. DRF checks each action it lists against that
+            # action's method, so roles only see what they may do.
+            return True
+        method = "GET" if request.method == "HEAD" else request.method
         try:
-            flag = bool(request.user.role == "HR" or request.user.role == "SU")
-        except:
-            pass
-        if not flag:
-            raise exceptions.UnprocessableEntityException(
-                detail={
-                    "title": "Unauthenticated",
-                    "message": "Not authenticated for HR Supervisor request",
-                },
-                code=401,
-            )
-        return flag
+            roles, denied_message = PERMISSION_MATRIX[(view.permission_scope, method)]
+        except KeyError:
+            # Not a method of this scope: DRF answers 405 Method Not Allowed.
+            return True
+        if request.user.role in roles:
+            return True
+        raise exceptions.UnprocessableEntityException(
+            detail={
+                "title": "Unauthenticated",
+                "message": denied_message,
+            },
+            code=401,
+        )
 
     def has_object_permission(self, request, view, obj):
         return True
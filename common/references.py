@@ -0,0 +1,94 @@
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from rest_framework import serializers
+
+
+class ReferenceResolver:
+    """
+    Collects the primary keys a payload refers to and loads them with one
+    ``IN`` query per model, so validation and ``save()`` share the instances.
+    """
+
+    def __init__(self):
+        self._pending = defaultdict(set)
+        self._resolved = defaultdict(dict)
+
+    def add(self, model, *pks):
+        for pk in pks:
+            key = self._key(model, pk)
+            if key is not None and key not in self._resolved[model]:
+                self._pending[model].add(key)
+        return self
+
+    def resolve(self):
+        for model, pks in self._pending.items():
+            # Missing rows are kept as None, so they are not looked up again.
+            found = model._default_manager.in_bulk(pks)
+            self._resolved[model].update({pk: found.get(pk) for pk in pks})
+        self._pending.clear()
+        return self
+
+    def prime(self, *instances):
+        for instance in instances:
+            if instance is not None:
+                model = instance._meta.concrete_model
+                self._resolved[model][instance.pk] = instance
+                self._pending[model].discard(instance.pk)
+        return self
+
+    def get(self, model, pk):
+        key = self._key(model, pk)
+        if key is None:
+            return None
+        if key not in self._resolved[model]:
+            self.add(model, key)
+        if self._pending:
+            self.resolve()
+        return self._resolved[model].get(key)
+
+    def get_many(self, model, pks):
+        self.add(model, *pks)
+        if self._pending:
+            self.resolve()
+        return {key: self.get(model, key) for key in pks}
+
+    @staticmethod
+    def _key(model, pk):
+        if pk is None or isinstance(pk, bool):
+            return None
+        try:
+            return model._meta.pk.to_python(pk)
+        except (TypeError, ValidationError):
+            return None
+
+
+class ResolvedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Takes instances from the serializer's ``ReferenceResolver`` instead of
+    running its own ``get()`` per value.
+    """
+
+    def to_internal_value(self, data):
+        references = self.context.get("references")
+        if references is not None:
+            instance = references.get(self.get_queryset().model, data)
+            if instance is not None:
+                return instance
+        return super().to_internal_value(data)
+
+
+class ReferenceResolverMixin:
+    serializer_related_field = ResolvedPrimaryKeyRelatedField
+
+    @property
+    def references(self):
+        references = self.context.get("references")
+        if references is None:
+            references = self.context["references"] = ReferenceResolver()
+            # Relations loaded with the instance (select_related) are
+            # references the payload usually repeats, so start from them.
+            if isinstance(self.instance, models.Model):
+                references.prime(*self.instance._state.fields_cache.values())
+        return references
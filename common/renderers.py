@@ -0,0 +1,99 @@
+import json
+
+from django.conf import settings
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import encoders
+
+_default = encoders.JSONEncoder().default
+
+
+def _escape_separators(content):
+    # Valid JSON, but not valid JavaScript before ES2019; DRF's renderer
+    # escapes them, so every backend does too.
+    return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+        b"\xe2\x80\xa9", b"\\u2029"
+    )
+
+
+def _orjson():
+    import orjson
+
+    # Datetimes go through DRF's encoder so they keep its "Z" suffix.
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(data):
+        return _escape_separators(orjson.dumps(data, default=_default, option=option))
+
+    return dumps, orjson.loads
+
+
+def _ujson():
+    import ujson
+
+    def dumps(data):
+        content = ujson.dumps(
+            data, ensure_ascii=False, escape_forward_slashes=False, default=_default
+        )
+        return _escape_separators(content.encode())
+
+    return dumps, ujson.loads
+
+
+def _stdlib():
+    encoder = encoders.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(data):
+        return _escape_separators(encoder.encode(data).encode())
+
+    return dumps, json.loads
+
+
+JSON_BACKENDS = {
+    "orjson": _orjson,
+    "ujson": _ujson,
+    "json": _stdlib,
+}
+
+
+def load_json_backend(names=None):
+    """
+    ``(name, dumps, loads)`` for the first importable backend in ``names``,
+    which defaults to ``settings.JSON_BACKENDS``. The stdlib is always last.
+    """
+    if names is None:
+        names = getattr(settings, "JSON_BACKENDS", ("orjson", "ujson"))
+    for name in (*names, "json"):
+        try:
+            return (name, *JSON_BACKENDS[name]())
+        except ImportError:
+            continue
+
+
+JSON_BACKEND, dumps, loads = load_json_backend()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer that encodes with the configured backend (orjson when it is
+    installed). Output is compact UTF-8 with U+2028 and U+2029 escaped and
+    ``/`` left as is, like the stock renderer; a requested indent falls back
+    to the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(parsers.JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
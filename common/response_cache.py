@@ -0,0 +1,130 @@
+import hashlib
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class ResponseCache:
+    """
+    Caches list responses under a key made of the view, the full request URL
+    and the user's role or id, plus a generation token per model the view
+    reads. A write to one of those models replaces its token, so every
+    response built from the old data stops being looked up and ages out of
+    the backend.
+
+    A token replaced in one process must reach every other one, so with a
+    backend that is not ``shared`` the cache is only ``enabled`` when there
+    is a single worker.
+
+    Hits and misses are counted per view in this process.
+    """
+
+    def __init__(self, backend, timeout=None, workers=1):
+        self.backend = backend
+        self.timeout = timeout
+        self.workers = workers
+        self.hits = Counter()
+        self.misses = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return getattr(self.backend, "shared", False) or self.workers <= 1
+
+    @staticmethod
+    def generation_key(model):
+        return f"generation:{model._meta.label}"
+
+    def generations(self, models):
+        keys = [self.generation_key(model) for model in models]
+        tokens = self.backend.get_many(keys)
+        for key in keys:
+            if key not in tokens:
+                tokens[key] = uuid.uuid4().hex
+                self.backend.set(key, tokens[key], ttl=0)
+        return [tokens[key] for key in keys]
+
+    def bump(self, *models):
+        # A fresh token rather than a counter: a token evicted from the
+        # backend can never come back with a value that was used before.
+        for model in models:
+            self.backend.set(self.generation_key(model), uuid.uuid4().hex, ttl=0)
+
+    def key(self, view, request):
+        url = hashlib.sha1(request.build_absolute_uri().encode()).hexdigest()
+        generations = ":".join(self.generations(view.cache_models))
+        owner = response_owner(view, request)
+        return f"response:{type(view).__name__}:{owner}:{generations}:{url}"
+
+    def get(self, key, name):
+        data = self.backend.get(key)
+        with self._lock:
+            (self.misses if data is None else self.hits)[name] += 1
+        return data
+
+    def set(self, key, data):
+        self.backend.set(key, data, ttl=self.timeout)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+    def stats(self):
+        with self._lock:
+            views = {
+                name: {"hits": self.hits[name], "misses": self.misses[name]}
+                for name in sorted(self.hits.keys() | self.misses.keys())
+            }
+        hits = sum(view["hits"] for view in views.values())
+        misses = sum(view["misses"] for view in views.values())
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            # Django's caches cannot count their entries.
+            "entries": len(self.backend) if hasattr(self.backend, "__len__") else None,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "views": views,
+        }
+
+
+def response_owner(view, request):
+    """
+    Who a list response is for: the user on views with ``cache_scope =
+    "user"``, else their role. Cache keys and ETags both use it, so a page
+    cached for one user carries the ETag every user it is served to gets.
+    """
+    scope = getattr(view, "cache_scope", "user")
+    user = request.user
+    return f"{scope}:{user.pk if scope == 'user' else getattr(user, 'role', None)}"
+
+
+def load_response_cache():
+    backend = import_string(
+        getattr(settings, "RESPONSE_CACHE_BACKEND", "common.cache.DjangoCache")
+    )
+    return ResponseCache(
+        backend(**getattr(settings, "RESPONSE_CACHE_OPTIONS", {})),
+        timeout=getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300),
+        workers=getattr(settings, "RESPONSE_CACHE_WORKERS", 1),
+    )
+
+
+response_cache = load_response_cache()
+
+
+def invalidate_responses(*models):
+    """
+    Drops cached responses built from ``models``. The tokens are replaced
+    now and again on commit, so a response cached from the old rows while
+    the transaction was still open does not survive it.
+    """
+    response_cache.bump(*models)
+    transaction.on_commit(lambda: response_cache.bump(*models))
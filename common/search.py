@@ -0,0 +1,260 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework.filters import BaseFilterBackend
+
+from common.exceptions import UnprocessableEntityException
+
+SEARCH_BACKENDS = {
+    "postgresql": "common.search.PostgresSearchBackend",
+    "sqlite": "common.search.SQLiteSearchBackend",
+}
+
+# Tables and the text columns they are searched on, best weighted first.
+SEARCH_DOCUMENTS = {
+    "assigner_project": ("name", "description"),
+    "assigner_task": ("title", "description"),
+}
+SEARCH_MIGRATION = ("assigner", "0007_search_index")
+
+# Weights for the indexed columns, best first: a hit in a title outranks a hit
+# in a description.
+SEARCH_WEIGHTS = ("A", "B", "C", "D")
+
+
+class SearchBackend:
+    """
+    Full-text search over a table's text columns.
+
+    The index is kept current inside the database, so ``bulk_create()`` and
+    ``update()`` are covered as well as ``save()``. ``install_sql()`` drops
+    and recreates it, for tables where ``is_installed()`` finds it missing.
+    ``search()`` narrows a queryset to the matching rows and annotates them
+    with ``rank``, higher is better.
+    """
+
+    def install_sql(self, table, columns):
+        raise NotImplementedError
+
+    def is_installed(self, connection, table):
+        raise NotImplementedError
+
+    def uninstall_sql(self, table, columns):
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    A stored ``tsvector`` column generated from the text columns, with a GIN
+    index. PostgreSQL recomputes the column on every write, so there is no
+    trigger to keep in step with the model.
+    """
+
+    config = "english"
+    column = "search_vector"
+
+    def document(self, columns):
+        return " || ".join(
+            f"setweight(to_tsvector('{self.config}'::regconfig, "
+            f"coalesce(\"{column}\", '')), '{weight}')"
+            for column, weight in zip(columns, SEARCH_WEIGHTS)
+        )
+
+    def install_sql(self, table, columns):
+        return [
+            *self.uninstall_sql(table, columns),
+            f'ALTER TABLE "{table}" ADD COLUMN "{self.column}" tsvector '
+            f"GENERATED ALWAYS AS ({self.document(columns)}) STORED",
+            f'CREATE INDEX "{table}_search_idx" ON "{table}" '
+            f'USING GIN ("{self.column}")',
+        ]
+
+    def uninstall_sql(self, table, columns):
+        return [
+            f'DROP INDEX IF EXISTS "{table}_search_idx"',
+            f'ALTER TABLE "{table}" DROP COLUMN IF EXISTS "{self.column}"',
+        ]
+
+    def is_installed(self, connection, table):
+        with connection.cursor() as cursor:
+            return f"{table}_search_idx" in connection.introspection.get_constraints(
+                cursor, table
+            )
+
+    def search(self, queryset, query):
+        table = queryset.model._meta.db_table
+        vector = f'"{table}"."{self.column}"'
+        tsquery = f"websearch_to_tsquery('{self.config}'::regconfig, %s)"
+        return queryset.filter(
+            RawSQL(
+                f"{vector} @@ {tsquery}", [query], output_field=models.BooleanField()
+            )
+        ).annotate(
+            # ts_rank() is a float4; widened so the rank a cursor carries as
+            # a Python float compares equal to the one in the keyset filter.
+            rank=RawSQL(
+                f"ts_rank({vector}, {tsquery})::float8",
+                [query],
+                output_field=models.FloatField(),
+            )
+        )
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    An external content FTS5 table per indexed table, keyed by the table's
+    rowid and filled by triggers.
+
+    SQLite may renumber the rowids of a table without an INTEGER PRIMARY KEY
+    on VACUUM, which needs ``install_sql()`` again. Django rebuilds SQLite
+    tables, dropping the triggers, for some ``AlterField`` operations; that
+    is repaired after every ``migrate``.
+    """
+
+    triggers = ("insert", "update", "delete")
+
+    def fts_table(self, table):
+        return f"{table}_fts"
+
+    def install_sql(self, table, columns):
+        fts = self.fts_table(table)
+        names = ", ".join(f'"{column}"' for column in columns)
+        new = ", ".join(f'new."{column}"' for column in columns)
+        old = ", ".join(f'old."{column}"' for column in columns)
+        insert = f'INSERT INTO "{fts}" (rowid, {names}) VALUES (new.rowid, {new});'
+        delete = (
+            f'INSERT INTO "{fts}" ("{fts}", rowid, {names}) '
+            f"VALUES ('delete', old.rowid, {old});"
+        )
+        return [
+            *self.uninstall_sql(table, columns),
+            f'CREATE VIRTUAL TABLE "{fts}" USING fts5({names}, '
+            f"content = '{table}', tokenize = 'porter unicode61')",
+            f'INSERT INTO "{fts}" ("{fts}") ' "VALUES ('rebuild')",
+            f'CREATE TRIGGER "{fts}_insert" AFTER INSERT ON "{table}" '
+            f"BEGIN {insert} END",
+            f'CREATE TRIGGER "{fts}_update" AFTER UPDATE OF {names} ON "{table}" '
+            f"BEGIN {delete} {insert} END",
+            f'CREATE TRIGGER "{fts}_delete" AFTER DELETE ON "{table}" '
+            f"BEGIN {delete} END",
+        ]
+
+    def uninstall_sql(self, table, columns):
+        fts = self.fts_table(table)
+        return [
+            *(f'DROP TRIGGER IF EXISTS "{fts}_{name}"' for name in self.triggers),
+            f'DROP TABLE IF EXISTS "{fts}"',
+        ]
+
+    def is_installed(self, connection, table):
+        fts = self.fts_table(table)
+        names = [fts, *(f"{fts}_{name}" for name in self.triggers)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type IN ('table', "
+                f"'trigger') AND name IN ({', '.join(['%s'] * len(names))})",
+                names,
+            )
+            return cursor.fetchone()[0] == len(names)
+
+    def search(self, queryset, query):
+        table = queryset.model._meta.db_table
+        fts = self.fts_table(table)
+        # Every word is quoted, so FTS5 operators in the input are literals.
+        match = " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+        if not match:
+            return queryset.none().annotate(
+                rank=models.Value(0.0, output_field=models.FloatField())
+            )
+        # Joined rather than looked up per row, so FTS5 walks the match list
+        # once. bm25() is lower for better matches and weighs the first
+        # column up.
+        return queryset.extra(
+            tables=[fts],
+            where=[f'"{fts}" MATCH %s', f'"{fts}".rowid = "{table}".rowid'],
+            params=[match],
+        ).annotate(
+            rank=RawSQL(f'-bm25("{fts}", 4.0)', [], output_field=models.FloatField())
+        )
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """
+    The backend for the database vendor of ``using``, from
+    ``settings.SEARCH_BACKENDS`` falling back to ``SEARCH_BACKENDS``.
+    """
+    vendor = connections[using].vendor
+    backends = {**SEARCH_BACKENDS, **getattr(settings, "SEARCH_BACKENDS", {})}
+    try:
+        return import_string(backends[vendor])()
+    except KeyError:
+        raise ImproperlyConfigured(f"No search backend for {vendor}.")
+
+
+def install_missing_search_index(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Reinstalls the index of the SEARCH_DOCUMENTS tables that lost it, e.g.
+    to a table rebuild, once SEARCH_MIGRATION has created it. Connected to
+    ``post_migrate``; returns the tables it installed.
+    """
+    connection = connections[using]
+    if SEARCH_MIGRATION not in MigrationRecorder(connection).applied_migrations():
+        return []
+    try:
+        backend = get_search_backend(using)
+    except ImproperlyConfigured:
+        return []
+    missing = [
+        table
+        for table in SEARCH_DOCUMENTS
+        if not backend.is_installed(connection, table)
+    ]
+    with connection.cursor() as cursor:
+        for table in missing:
+            for statement in backend.install_sql(table, SEARCH_DOCUMENTS[table]):
+                cursor.execute(statement)
+    return missing
+
+
+class SearchFilter(BaseFilterBackend):
+    """
+    ``?q=words`` through the search backend, best match first. Ordered by
+    ``("-rank", "-id")`` so the cursor paginator can page through the
+    results.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            raise UnprocessableEntityException(
+                {
+                    "title": "Search",
+                    "message": "Search query is required",
+                }
+            )
+        return (
+            get_search_backend(queryset.db)
+            .search(queryset, query)
+            .order_by("-rank", "-id")
+        )
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": True,
+                "in": "query",
+                "description": "Words to search for",
+                "schema": {"type": "string"},
+            }
+        ]
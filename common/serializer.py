@@ -1,3 +1,6 @@
+from django.core.exceptions import ImproperlyConfigured
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema_field
 from rest_framework import serializers
 
 
@@ -8,3 +11,114 @@ class OperationError(serializers.Serializer):
 
 class OperationSuccess(OperationError):
     data = serializers.JSONField(default={})
+
+
+def envelope(title, message, data):
+    """The ``OperationSuccess`` body every endpoint responds with."""
+    return {"title": title, "message": message, "data": data}
+
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    type=str,
+    description="Comma separated fields to return, e.g. id,title,status",
+)
+
+
+@extend_schema_field(OpenApiTypes.STR)
+class ChoiceLabelField(serializers.ReadOnlyField):
+    """Renders a choice value as its label from a precomputed ``labels`` dict."""
+
+    def __init__(self, labels, **kwargs):
+        self.labels = labels
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return self.labels.get(value, value)
+
+
+# Fields whose value from ``values()`` is already what to_representation gives.
+VALUES_IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.ReadOnlyField,
+)
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """
+    Serializes rows of a ``values()`` queryset: one dict per row, with a
+    converter per field only where the raw column value needs one.
+    """
+
+    def to_representation(self, data):
+        columns = self.child.get_columns(self.context.get("fields"))
+        rows = []
+        for row in data:
+            item = {}
+            for name, column, convert in columns:
+                value = row[column]
+                item[name] = (
+                    value if convert is None or value is None else convert(value)
+                )
+            rows.append(item)
+        return rows
+
+
+class ValuesSerializer(serializers.ModelSerializer):
+    """
+    Read-only ModelSerializer for list endpoints that read ``values()`` rows
+    instead of model instances. Only flat fields are supported; the view
+    selects ``values_columns()``. Subclasses declare
+    ``class Meta(ValuesSerializer.Meta)`` to keep the list serializer.
+    """
+
+    class Meta:
+        list_serializer_class = ValuesListSerializer
+
+    _columns = {}
+
+    def get_columns(self, fields=None):
+        """
+        ``(name, values() column, converter or None)`` per readable field,
+        limited to ``fields`` when given.
+        """
+        try:
+            columns = ValuesSerializer._columns[self.__class__]
+        except KeyError:
+            columns = ValuesSerializer._columns[self.__class__] = self.build_columns()
+        if fields is None:
+            return columns
+        return [column for column in columns if column[0] in fields]
+
+    def build_columns(self):
+        columns = []
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(
+                field, (serializers.BaseSerializer, serializers.ManyRelatedField)
+            ):
+                raise ImproperlyConfigured(
+                    f"{self.__class__.__name__}.{name} cannot be read from values()."
+                )
+            if isinstance(field, serializers.UUIDField):
+                convert = str
+            elif isinstance(field, VALUES_IDENTITY_FIELDS) and not isinstance(
+                field, ChoiceLabelField
+            ):
+                convert = None
+            else:
+                convert = field.to_representation
+            columns.append((name, field.source.replace(".", "__"), convert))
+        return columns
+
+    @classmethod
+    def field_names(cls):
+        return [name for name, _, _ in cls().get_columns()]
+
+    @classmethod
+    def values_columns(cls, fields=None):
+        return [column for _, column, _ in cls().get_columns(fields)]
@@ -1,5 +1,15 @@
+from django.apps import apps
+from django.db import connection, transaction
 from django.utils.text import slugify
-import string, random, re
+import string, random
+
+from common.validators import (  # noqa: F401
+    validate_email,
+    validate_password,
+    validate_phone,
+    validate_url,
+    validate_uuid,
+)
 
 
 def random_string_generator(size=10, chars=string.ascii_lowercase + string.digits):
@@ -7,60 +17,38 @@ def random_string_generator(size=10, chars=string.ascii_lowercase + string.digit
 
 
 def unique_slug_generator(instance, new_slug=None):
-    if new_slug is not None:
-        slug = new_slug
-    else:
-        slug = slugify(instance.full_name)
-    klass = instance.__class__
-    qs_exists = klass.objects.filter(slug=slug).exists()
-    if qs_exists:
-        new_slug = "{slug}--{randstr}".format(
-            slug=slug, randstr=random_string_generator(size=4)
-        )
-        return unique_slug_generator(instance, new_slug=new_slug)
-    return slug
-
-
-def validate_password(password):
-    pattern = r"^(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$"
-    p = re.compile(pattern)
-    if re.search(p, password):
-        return True
-    return False
-
-
-def validate_phone(phone):
-    pattern = r"^(?:\+977|977|0)?(?:98[4-7]|97[7-8]|96[4-6]|985|984|980|981|982|961|962|988|960|972|963|972|973|974|975|976|977|978|980|981|982|983|984|985|986)\d{7}$"
-    if not re.match(pattern, str(phone)):
-        return False
-    return True
-
-
-def validate_email(email):
-    url_pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-    p = re.compile(url_pattern)
-    if re.search(p, email):
-        return True
-    return False
-
-
-def validate_url(image):
-    url_pattern = (
-        "((http|https)://)(www.)?"
-        + "[a-zA-Z0-9@:%._\\+~#?&//=]"
-        + "{2,256}\\.[a-z]"
-        + "{2,6}\\b([-a-zA-Z0-9@:%"
-        + "._\\+~#?&//=]*)"
-    )
-    p = re.compile(url_pattern)
-    if re.search(p, image):
-        return True
-    return False
-
-
-def validate_uuid(id):
-    uuid_pattern = "^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
-    p = re.compile(uuid_pattern)
-    if re.match(p, id):
-        return True
-    return False
+    """
+    Returns the slug (or ``new_slug``) suffixed with the next number from its
+    counter row, e.g. ``ram-bahadur--3``. Costs a single upsert however many
+    users share the name; callers retry on the unique constraint when the
+    slug was taken some other way.
+    """
+    max_length = instance.__class__._meta.get_field("slug").max_length
+    slug = new_slug or slugify(instance.full_name) or random_string_generator()
+    # Leave room for the numeric suffix.
+    slug = slug[: max_length - 12].strip("-")
+    number = next_slug_number(slug)
+    if number == 1:
+        return slug
+    return f"{slug}--{number}"
+
+
+def next_slug_number(slug):
+    SlugCounter = apps.get_model("assigner", "SlugCounter")
+    if connection.vendor in ("postgresql", "sqlite"):
+        qn = connection.ops.quote_name
+        table = qn(SlugCounter._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({qn('slug')}, {qn('last')}) VALUES (%s, 1) "
+                f"ON CONFLICT ({qn('slug')}) "
+                f"DO UPDATE SET {qn('last')} = {table}.{qn('last')} + 1 "
+                f"RETURNING {qn('last')}",
+                [slug],
+            )
+            return cursor.fetchone()[0]
+    with transaction.atomic():
+        counter, _ = SlugCounter.objects.select_for_update().get_or_create(slug=slug)
+        counter.last += 1
+        counter.save(update_fields=["last"])
+        return counter.last
@@ -0,0 +1,64 @@
+import re
+
+PASSWORD_PATTERN = re.compile(
+    r"^(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$"
+)
+PHONE_PATTERN = re.compile(
+    r"^(?:\+977|977|0)?(?:98[4-7]|97[7-8]|96[4-6]|985|984|980|981|982|961|962|988|960|972|963|972|973|974|975|976|977|978|980|981|982|983|984|985|986)\d{7}$"
+)
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+URL_PATTERN = re.compile(
+    "((http|https)://)(www.)?"
+    + "[a-zA-Z0-9@:%._\\+~#?&//=]"
+    + "{2,256}\\.[a-z]"
+    + "{2,6}\\b([-a-zA-Z0-9@:%"
+    + "._\\+~#?&//=]*)"
+)
+UUID_PATTERN = re.compile(
+    "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+
+VALIDATORS = {}
+
+
+def register(name):
+    def decorator(func):
+        VALIDATORS[name] = func
+        return func
+
+    return decorator
+
+
+def validate(name, value):
+    return VALIDATORS[name](value)
+
+
+@register("password")
+def validate_password(password):
+    return isinstance(password, str) and PASSWORD_PATTERN.search(password) is not None
+
+
+@register("phone")
+def validate_phone(phone):
+    return PHONE_PATTERN.match(str(phone)) is not None
+
+
+@register("email")
+def validate_email(email):
+    return isinstance(email, str) and EMAIL_PATTERN.search(email) is not None
+
+
+@register("url")
+def validate_url(image):
+    return isinstance(image, str) and URL_PATTERN.search(image) is not None
+
+
+@register("uuid")
+def validate_uuid(id):
+    # The type and length checks only pre-filter: they reject what cannot be
+    # a uuid without the regex, but every 36 character string is still
+    # matched against UUID_PATTERN, which measured faster than a pure-Python
+    # hex check (see bench_validators).
+    return (
+        isinstance(id, str) and len(id) == 36 and UUID_PATTERN.fullmatch(id) is not None
+    )
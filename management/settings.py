@@ -95,6 +95,29 @@ DATABASES = {
 }
 
 
+# Password hashing
+# The first hasher hashes new passwords. Passwords stored with another hasher
+# or another iteration count are rehashed on the next successful login, so
+# PASSWORD_HASHER_ITERATIONS can be lowered for load tests and raised again.
+
+PASSWORD_HASHER_ITERATIONS = int(os.environ.get("PASSWORD_HASHER_ITERATIONS", "600000"))
+
+PASSWORD_HASHERS = list(
+    dict.fromkeys(
+        [
+            os.environ.get(
+                "PASSWORD_HASHER", "common.hashers.TunablePBKDF2PasswordHasher"
+            ),
+            "common.hashers.TunablePBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+            "django.contrib.auth.hashers.Argon2PasswordHasher",
+            "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+            "django.contrib.auth.hashers.ScryptPasswordHasher",
+        ]
+    )
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -144,7 +167,16 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "common.authentication.CachedJWTAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "common.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "common.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
@@ -158,6 +190,50 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# JSON libraries to try for API responses, in order; the stdlib is the fallback.
+JSON_BACKENDS = tuple(
+    name for name in os.environ.get("JSON_BACKENDS", "orjson,ujson").split(",") if name
+)
+
+# Users resolved from access tokens are cached per process for this long.
+USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", "60"))
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "4096"))
+JWT_TRUST_USER_CLAIMS = os.environ.get("JWT_TRUST_USER_CLAIMS", "") == "1"
+
+# List responses are cached until a model they read is written, or for
+# RESPONSE_CACHE_TIMEOUT seconds, in the "responses" Django cache. Writes are
+# seen by every worker only when that cache is shared: with RESPONSE_CACHE_URL
+# it is Redis, otherwise it is per process and only used when
+# WEB_CONCURRENCY (the worker count) is 1.
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "responses": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["RESPONSE_CACHE_URL"],
+            "KEY_PREFIX": "pm",
+        }
+        if os.environ.get("RESPONSE_CACHE_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "responses",
+            "OPTIONS": {
+                "MAX_ENTRIES": int(os.environ.get("RESPONSE_CACHE_SIZE", "2048"))
+            },
+        }
+    ),
+}
+RESPONSE_CACHE_BACKEND = "common.cache.DjangoCache"
+RESPONSE_CACHE_OPTIONS = {"alias": "responses"}
+RESPONSE_CACHE_WORKERS = int(os.environ.get("WEB_CONCURRENCY", "1"))
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", "300"))
+
+# sync/ only hands out rows older than this, so a transaction that commits
+# late cannot slip behind a client's token. Tombstones, and with them sync
+# tokens, are kept for SYNC_TOMBSTONE_DAYS (see prune_tombstones).
+SYNC_SETTLE_SECONDS = int(os.environ.get("SYNC_SETTLE_SECONDS", "5"))
+SYNC_TOMBSTONE_DAYS = int(os.environ.get("SYNC_TOMBSTONE_DAYS", "30"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=1440),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=14),